@@ -9,6 +9,7 @@ django.setup()
 
 # Import your models here
 from main_app.models import Pet, Artifact, Location, Car, Task, HotelRoom, Character
+from reports import write_lines
 
 
 def create_pet(name: str, species: str) -> str:
@@ -45,13 +46,14 @@ def delete_all_artifacts():
     artefacts.delete()
 
 
-def show_all_locations():
-    result = []
+def iter_all_locations(chunk_size=2000):
     locations = Location.objects.all().order_by('-id')
-    for location in locations:
-        result.append(f"{location.name} has a population of {location.population}!")
+    for location in locations.iterator(chunk_size=chunk_size):
+        yield f"{location.name} has a population of {location.population}!"
 
-    return '\n'.join(result)
+
+def show_all_locations():
+    return '\n'.join(iter_all_locations())
 
 
 def new_capital():
@@ -1,7 +1,8 @@
 import os
+from decimal import Decimal
 
 import django
-from django.db.models import Q, Count, Avg, F
+from django.db.models import Q
 
 # Set up Django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
@@ -10,13 +11,13 @@ django.setup()
 
 # Import your models here
 from main_app.models import Director, Actor, Movie
+from reports import write_lines
 
 
 # Create queries within functions
-def get_directors(search_name=None, search_nationality=None):
-    result = []
+def iter_directors(search_name=None, search_nationality=None, chunk_size=2000):
     if search_name is None and search_nationality is None:
-        return ''
+        return
 
     # query = Q()
 
@@ -29,60 +30,46 @@ def get_directors(search_name=None, search_nationality=None):
 
     directors = Director.objects.filter(query).order_by('full_name')
 
-    for d in directors:
-        result.append(f"Director: {d.full_name}, "
-                      f"nationality: {d.nationality}, "
-                      f"experience: {d.years_of_experience}")
+    for d in directors.iterator(chunk_size=chunk_size):
+        yield (f"Director: {d.full_name}, "
+               f"nationality: {d.nationality}, "
+               f"experience: {d.years_of_experience}")
 
-    if not result:
-        return ''
 
-    return '\n'.join(result)
+def get_directors(search_name=None, search_nationality=None):
+    return '\n'.join(iter_directors(search_name, search_nationality))
 
 
 def get_top_director():
-    top_director = Director.objects.get_directors_by_movies_count().first()
+    top_directors = Director.objects.get_cached_directors_by_movies_count(1)
 
-    if not top_director:
+    if not top_directors:
         return ''
 
-    return f"Top Director: {top_director.full_name}, movies: {top_director.movie_count}."
+    top_director = top_directors[0]
+
+    return f"Top Director: {top_director['full_name']}, movies: {top_director['movie_count']}."
 
 
 def get_top_actor():
-    actor = Actor.objects.annotate(
-        movie_count=Count('movies_starring'),
-        average_rating=Avg('movies_starring__rating')
-    ).order_by(
-        '-movie_count',
-        'full_name'
-    ).first()
-
-    if not actor or not actor.movies_starring.all():
-        return ''
+    actor = Actor.objects.top_with_filmography()
 
-    movie_starring = []
-    for movie in actor.movies_starring.all():
-        movie_starring.append(movie.title)
+    if not actor:
+        return ''
 
     return (f"Top Actor: {actor.full_name}, "
-            f"starring in movies: {', '.join(movie_starring)}, "
+            f"starring in movies: {actor.filmography}, "
             f"movies average rating: {actor.average_rating:.1f}")
 
 
 # Django queries 2
 def get_actors_by_movies_count():
-    actors = Actor.objects.annotate(
-        movies_count=Count("movies_actor")
-    ).order_by(
-        "-movies_count",
-        "full_name"
-    )[:3]
+    actors = Actor.objects.get_cached_actors_by_appearances_count(3)
 
     result = []
     for actor in actors:
-        if actor.movies_count:
-            result.append(f"{actor.full_name}, participated in {actor.movies_count} movies")
+        if actor['movies_count']:
+            result.append(f"{actor['full_name']}, participated in {actor['movies_count']} movies")
 
     return "\n".join(result)
 
@@ -115,13 +102,10 @@ def get_top_rated_awarded_movie():
 
 
 def increase_rating():
-    query = Q(is_classic=True) & Q(rating__lt=10)
-    classic_movies = Movie.objects.filter(query)
-
-    if not classic_movies:
-        return f"No ratings increased."
+    # Capped at the rating's MaxValueValidator, and classics already at 10 are left out
+    increased_ids = Movie.objects.filter(is_classic=True).increment('rating', Decimal('0.1'))
 
-    count = classic_movies.aggregate(count_movies=Count("title"))["count_movies"]
-    classic_movies.update(rating=F("rating") + 0.1)
+    if not increased_ids:
+        return "No ratings increased."
 
-    return f"Rating increased for {count} movies."
+    return f"Rating increased for {len(increased_ids)} movies."
@@ -0,0 +1 @@
+pytest_plugins = ['query_budget.pytest_plugin']
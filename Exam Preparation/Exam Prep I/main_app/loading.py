@@ -0,0 +1,341 @@
+import csv
+import io
+import json
+import os
+import time
+from itertools import islice
+
+from django.db import connection, transaction
+
+from main_app.managers import invalidate_leaderboards
+from main_app.models import Director, Actor, Movie
+
+TRUE_VALUES = {'1', 't', 'true', 'y', 'yes'}
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def flag(value):
+    return 't' if value.strip().lower() in TRUE_VALUES else 'f'
+
+
+def field_default(model, field_name):
+    return str(model._meta.get_field(field_name).default)
+
+
+def people_by_natural_key(model):
+    people = model.objects.values_list('pk', 'full_name', 'birth_date')
+
+    return {(full_name, birth_date.isoformat()): pk for pk, full_name, birth_date in people.iterator(chunk_size=50000)}
+
+
+def read_dump(path, columns, skip=0):
+    # .csv files are comma separated, everything else is treated as a TSV dump
+    delimiter = ',' if path.endswith('.csv') else '\t'
+
+    with open(path, newline='', encoding='utf-8') as file:
+        reader = csv.reader(file, delimiter=delimiter)
+        header = next(reader)
+
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise ValueError(f'{path} is missing the columns: {", ".join(missing)}')
+
+        indexes = [header.index(column) for column in columns]
+
+        for row in islice(reader, skip, None):
+            yield [row[index] for index in indexes]
+
+
+class Stage:
+    name = None
+    model = None
+    columns = ()
+    fields = ()
+    natural_key = ()
+
+    def prepare(self):
+        pass
+
+    def convert(self, row):
+        return row
+
+    def merge(self, cursor, staging):
+        quote = connection.ops.quote_name
+        meta = self.model._meta
+        table = quote(meta.db_table)
+        columns = ', '.join(quote(meta.get_field(name).column) for name in self.fields)
+        keys = [quote(meta.get_field(name).column) for name in self.natural_key]
+
+        target_columns, values = columns, columns
+        auto_now = [quote(field.column) for field in meta.concrete_fields if getattr(field, 'auto_now', False)]
+        if auto_now:
+            target_columns += ', ' + ', '.join(auto_now)
+            values += ', ' + ', '.join('now()' for _ in auto_now)
+
+        # Rows already present under the natural key are left alone, so replaying a chunk is harmless
+        cursor.execute(
+            f'INSERT INTO {table} ({target_columns}) '
+            f'SELECT DISTINCT ON ({", ".join(keys)}) {values} FROM {staging} AS s '
+            f'WHERE NOT EXISTS ('
+            f'SELECT 1 FROM {table} AS t WHERE {" AND ".join(f"t.{key} = s.{key}" for key in keys)}'
+            f')'
+        )
+
+        return cursor.rowcount
+
+
+class DirectorStage(Stage):
+    name = 'directors'
+    model = Director
+    columns = ('full_name', 'birth_date', 'nationality', 'years_of_experience')
+    fields = columns
+    natural_key = ('full_name', 'birth_date')
+
+    def prepare(self):
+        self.defaults = [field_default(self.model, name) for name in self.fields]
+
+    def convert(self, row):
+        return [value or default for value, default in zip(row, self.defaults)]
+
+
+class ActorStage(DirectorStage):
+    name = 'actors'
+    model = Actor
+    columns = ('full_name', 'birth_date', 'nationality', 'is_awarded')
+    fields = columns
+
+    def convert(self, row):
+        full_name, birth_date, nationality, is_awarded = super().convert(row)
+
+        return full_name, birth_date, nationality, flag(is_awarded)
+
+
+class MovieStage(Stage):
+    name = 'movies'
+    model = Movie
+    columns = (
+        'title', 'release_date', 'storyline', 'genre', 'rating', 'is_classic', 'is_awarded',
+        'director_name', 'director_birth_date', 'starring_actor_name', 'starring_actor_birth_date',
+    )
+    fields = (
+        'title', 'release_date', 'storyline', 'genre', 'rating', 'is_classic', 'is_awarded',
+        'director', 'starring_actor',
+    )
+    natural_key = ('title', 'release_date')
+
+    def prepare(self):
+        self.directors = people_by_natural_key(Director)
+        self.actors = people_by_natural_key(Actor)
+        self.birth_date = field_default(Director, 'birth_date')
+        self.genre = field_default(Movie, 'genre')
+        self.rating = field_default(Movie, 'rating')
+
+    def convert(self, row):
+        (title, release_date, storyline, genre, rating, is_classic, is_awarded,
+         director_name, director_birth_date, actor_name, actor_birth_date) = row
+
+        director_id = self.directors.get((director_name, director_birth_date or self.birth_date))
+        if director_id is None:
+            return None
+
+        starring_actor_id = None
+        if actor_name:
+            starring_actor_id = self.actors.get((actor_name, actor_birth_date or self.birth_date))
+            if starring_actor_id is None:
+                return None
+
+        return (
+            title, release_date, storyline or None, genre or self.genre, rating or self.rating,
+            flag(is_classic), flag(is_awarded), director_id, starring_actor_id,
+        )
+
+
+class MovieActorStage(Stage):
+    name = 'movie_actors'
+    model = Movie.actors.through
+    columns = ('title', 'release_date', 'actor_name', 'actor_birth_date')
+    fields = ('movie', 'actor')
+
+    def prepare(self):
+        movies = Movie.objects.values_list('pk', 'title', 'release_date')
+        self.movies = {
+            (title, release_date.isoformat()): pk for pk, title, release_date in movies.iterator(chunk_size=50000)
+        }
+        self.actors = people_by_natural_key(Actor)
+        self.birth_date = field_default(Actor, 'birth_date')
+
+    def convert(self, row):
+        title, release_date, actor_name, actor_birth_date = row
+        movie_id = self.movies.get((title, release_date))
+        actor_id = self.actors.get((actor_name, actor_birth_date or self.birth_date))
+
+        if movie_id is None or actor_id is None:
+            return None
+
+        return movie_id, actor_id
+
+    def merge(self, cursor, staging):
+        quote = connection.ops.quote_name
+        meta = self.model._meta
+        columns = ', '.join(quote(meta.get_field(name).column) for name in self.fields)
+
+        cursor.execute(
+            f'INSERT INTO {quote(meta.db_table)} ({columns}) '
+            f'SELECT DISTINCT {columns} FROM {staging} '
+            f'ORDER BY {columns} '
+            f'ON CONFLICT DO NOTHING'
+        )
+
+        return cursor.rowcount
+
+
+STAGES = [DirectorStage, ActorStage, MovieStage, MovieActorStage]
+
+
+class Checkpoint:
+    def __init__(self, path=None):
+        self.path = path
+        self.state = {}
+
+        if path and os.path.exists(path):
+            with open(path) as file:
+                self.state = json.load(file)
+
+    def rows(self, stage, dump_path):
+        entry = self.state.get(stage, {})
+
+        return entry.get('rows', 0) if entry.get('path') == os.path.abspath(dump_path) else 0
+
+    def foreign_keys(self, stage):
+        return self.state.get(stage, {}).get('foreign_keys', [])
+
+    def save(self, stage, **values):
+        if 'path' in values:
+            values['path'] = os.path.abspath(values['path'])
+        self.state.setdefault(stage, {}).update(values)
+
+        if not self.path:
+            return
+
+        # Written to a temporary file first, so a crash never leaves a truncated checkpoint behind
+        temporary_path = f'{self.path}.tmp'
+        with open(temporary_path, 'w') as file:
+            json.dump(self.state, file)
+        os.replace(temporary_path, self.path)
+
+
+class LoadReport:
+    def __init__(self, stage, resumed_from=0):
+        self.stage = stage
+        self.resumed_from = resumed_from
+        self.rows = 0
+        self.inserted = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class MovieLoader:
+    def __init__(self, checkpoint_path=None, chunk_size=100000, without_foreign_keys=False):
+        self.checkpoint = Checkpoint(checkpoint_path)
+        self.chunk_size = chunk_size
+        self.without_foreign_keys = without_foreign_keys
+
+    def load(self, stage, path, on_chunk=None):
+        stage = stage()
+        resumed_from = self.checkpoint.rows(stage.name, path)
+        report = LoadReport(stage.name, resumed_from)
+        start = time.perf_counter()
+
+        # A run that died without restoring its foreign keys left them in the checkpoint
+        foreign_keys = self.checkpoint.foreign_keys(stage.name)
+        if self.without_foreign_keys and not foreign_keys:
+            foreign_keys = self.drop_foreign_keys(stage)
+
+        try:
+            stage.prepare()
+            rows = read_dump(path, stage.columns, skip=resumed_from)
+
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+
+                converted = [row for row in map(stage.convert, chunk) if row is not None]
+                report.rows += len(chunk)
+                report.skipped += len(chunk) - len(converted)
+
+                # Each chunk commits on its own and is only then checkpointed, so a restart resumes after it
+                if converted:
+                    report.inserted += self.load_chunk(stage, converted)
+                self.checkpoint.save(stage.name, path=path, rows=resumed_from + report.rows)
+
+                report.seconds = time.perf_counter() - start
+                if on_chunk:
+                    on_chunk(report)
+        finally:
+            if foreign_keys:
+                self.restore_foreign_keys(stage, foreign_keys)
+
+            # COPY and the merges send no signals, so the cached leaderboards are dropped here
+            if report.inserted:
+                invalidate_leaderboards()
+
+        report.seconds = time.perf_counter() - start
+
+        return report
+
+    def load_chunk(self, stage, rows):
+        quote = connection.ops.quote_name
+        meta = stage.model._meta
+        staging = quote(f'staging_{stage.name}')
+        columns = ', '.join(quote(meta.get_field(name).column) for name in stage.fields)
+        buffer = io.StringIO(''.join('\t'.join(map(copy_value, row)) + '\n' for row in rows))
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {staging} ON COMMIT DROP AS '
+                f'SELECT {columns} FROM {quote(meta.db_table)} WITH NO DATA'
+            )
+            cursor.copy_expert(f'COPY {staging} ({columns}) FROM STDIN', buffer)
+
+            return stage.merge(cursor, staging)
+
+    def drop_foreign_keys(self, stage):
+        table = connection.ops.quote_name(stage.model._meta.db_table)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'f'",
+                [stage.model._meta.db_table]
+            )
+            foreign_keys = [list(row) for row in cursor.fetchall()]
+
+            # Recorded before the drop commits, so a crashed run can still put them back
+            self.checkpoint.save(stage.name, foreign_keys=foreign_keys)
+            for name, _ in foreign_keys:
+                cursor.execute(f'ALTER TABLE {table} DROP CONSTRAINT {connection.ops.quote_name(name)}')
+
+        return foreign_keys
+
+    def restore_foreign_keys(self, stage, foreign_keys):
+        quote = connection.ops.quote_name
+        table = quote(stage.model._meta.db_table)
+
+        # NOT VALID skips the row-by-row check, VALIDATE then checks every row in one set-based scan
+        with connection.cursor() as cursor:
+            for name, definition in foreign_keys:
+                cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {quote(name)} {definition} NOT VALID')
+                cursor.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {quote(name)}')
+
+        self.checkpoint.save(stage.name, foreign_keys=[])
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from main_app.loading import MovieLoader, STAGES
+
+
+class Command(BaseCommand):
+    help = ('Loads directors, actors, movies and movie-actor links from TSV/CSV dumps through COPY '
+            'into staging tables, merging each chunk by natural key.')
+
+    def add_arguments(self, parser):
+        for stage in STAGES:
+            parser.add_argument(
+                f'--{stage.name.replace("_", "-")}',
+                dest=stage.name,
+                help=f'Dump with the columns: {", ".join(stage.columns)}.',
+            )
+        parser.add_argument('--chunk-size', type=int, default=100000)
+        parser.add_argument(
+            '--checkpoint',
+            help='JSON file recording the committed rows of every dump. A rerun with it resumes where the last one stopped.',
+        )
+
+        parser.add_argument(
+            '--without-foreign-keys',
+            action='store_true',
+            help='Drops the foreign keys of each table while it loads and validates them once at the end.',
+        )
+
+    def handle(self, *args, **options):
+        loader = MovieLoader(options['checkpoint'], options['chunk_size'], options['without_foreign_keys'])
+
+        for stage in STAGES:
+            path = options[stage.name]
+            if not path:
+                continue
+
+            report = loader.load(stage, path, on_chunk=self.write_progress if options['verbosity'] > 1 else None)
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{report.stage}: {report.rows} rows read, {report.inserted} inserted, {report.skipped} unresolved, '
+                f'in {report.seconds:.2f}s ({report.rows_per_second:.0f} rows/sec).'
+                + (f' Resumed after row {report.resumed_from}.' if report.resumed_from else '')
+            ))
+
+    def write_progress(self, report):
+        self.stdout.write(f'{report.stage}: {report.resumed_from + report.rows} rows ({report.rows_per_second:.0f} rows/sec)')
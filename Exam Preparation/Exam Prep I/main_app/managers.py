@@ -1,4 +1,81 @@
-from django.db.models import Manager, Count
+import time
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.core.cache import cache
+from django.db.models import Manager, QuerySet, Count, Avg
+
+from increments import IncrementQuerySetMixin
+
+LEADERBOARDS = ('directors', 'actors')
+LEADERBOARD_EVENTS = ('hit', 'stale', 'miss')
+LEADERBOARD_TTL = 60
+LEADERBOARD_LOCK_TTL = 10
+LEADERBOARD_GENERATION_KEY = 'leaderboards:generation'
+
+
+def count_leaderboard_event(name, event):
+    key = f'leaderboards:metrics:{name}:{event}'
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def leaderboard_metrics():
+    return {
+        name: {event: cache.get(f'leaderboards:metrics:{name}:{event}', 0) for event in LEADERBOARD_EVENTS}
+        for name in LEADERBOARDS
+    }
+
+
+def invalidate_leaderboards():
+    try:
+        cache.incr(LEADERBOARD_GENERATION_KEY)
+    except ValueError:
+        cache.set(LEADERBOARD_GENERATION_KEY, 1, None)
+
+
+def cached_leaderboard(name, limit, build):
+    # The entry keeps the generation it was built for, so an outdated board can still be served while it rebuilds
+    generation = cache.get_or_set(LEADERBOARD_GENERATION_KEY, 0, None)
+    key = f'leaderboards:{name}:{limit}'
+    lock_key = f'{key}:lock:{generation}'
+
+    entry = cache.get(key)
+    if entry is not None and entry[0] == generation:
+        count_leaderboard_event(name, 'hit')
+        return entry[1]
+
+    # Only the caller that takes the lock rebuilds, the others serve the outdated board or wait for the new one
+    acquired = cache.add(lock_key, 1, LEADERBOARD_LOCK_TTL)
+    if not acquired:
+        if entry is not None:
+            count_leaderboard_event(name, 'stale')
+            return entry[1]
+
+        deadline = time.monotonic() + LEADERBOARD_LOCK_TTL
+        while cache.get(lock_key) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        entry = cache.get(key)
+        if entry is not None and entry[0] == generation:
+            count_leaderboard_event(name, 'hit')
+            return entry[1]
+
+        # Taken over only if the holder released it without storing a board, a timed out wait builds without it
+        acquired = cache.add(lock_key, 1, LEADERBOARD_LOCK_TTL)
+
+    count_leaderboard_event(name, 'miss')
+    try:
+        rows = build(limit)
+        cache.set(key, (generation, rows), LEADERBOARD_TTL)
+    finally:
+        # A caller that timed out waiting builds without the lock and must not release the holder's
+        if acquired:
+            cache.delete(lock_key)
+
+    return rows
 
 
 class DirectorManager(Manager):
@@ -10,6 +87,11 @@ class DirectorManager(Manager):
             "full_name"
         )
 
+    def get_cached_directors_by_movies_count(self, limit=1):
+        return cached_leaderboard("directors", limit, lambda limit: list(
+            self.get_directors_by_movies_count().values("id", "full_name", "movie_count")[:limit]
+        ))
+
 
 class ActorManager(Manager):
     def get_actors_by_movies_count(self):
@@ -18,4 +100,35 @@ class ActorManager(Manager):
         ).order_by(
             "-movie_count",
             "full_name"
-        )
\ No newline at end of file
+        )
+
+    def get_actors_by_appearances_count(self):
+        return self.annotate(
+            movies_count=Count("movies_actor")
+        ).order_by(
+            "-movies_count",
+            "full_name"
+        )
+
+    def get_cached_actors_by_appearances_count(self, limit=3):
+        return cached_leaderboard("actors", limit, lambda limit: list(
+            self.get_actors_by_appearances_count().values("id", "full_name", "movies_count")[:limit]
+        ))
+
+    def top_with_filmography(self):
+        return self.annotate(
+            movie_count=Count("movies_starring"),
+            average_rating=Avg("movies_starring__rating"),
+            filmography=StringAgg("movies_starring__title", ", ", ordering="movies_starring__id"),
+        ).filter(
+            movie_count__gt=0
+        ).order_by(
+            "-movie_count",
+            "full_name"
+        ).only(
+            "full_name"
+        ).first()
+
+
+class MovieQuerySet(IncrementQuerySetMixin, QuerySet):
+    pass
@@ -1,7 +1,7 @@
 from django.core.validators import MinLengthValidator, MaxLengthValidator, MinValueValidator, MaxValueValidator
 from django.db import models
 
-from main_app.managers import DirectorManager, ActorManager
+from main_app.managers import DirectorManager, ActorManager, MovieQuerySet
 
 
 # Create your models here.
@@ -101,5 +101,7 @@ class Movie(IsAwarded, LastUpdated):
         related_name='movies_actor',
     )
 
+    objects = MovieQuerySet.as_manager()
+
     def __str__(self):
         return self.title
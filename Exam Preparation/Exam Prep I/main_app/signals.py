@@ -0,0 +1,23 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from main_app.managers import invalidate_leaderboards
+from main_app.models import Director, Actor, Movie
+
+
+# Deferred to commit so a reader cannot cache the old counts under the new generation
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+@receiver(post_save, sender=Director)
+@receiver(post_delete, sender=Director)
+@receiver(post_save, sender=Actor)
+@receiver(post_delete, sender=Actor)
+def invalidate_on_change(sender, **kwargs):
+    transaction.on_commit(invalidate_leaderboards)
+
+
+@receiver(m2m_changed, sender=Movie.actors.through)
+def invalidate_on_cast_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(invalidate_leaderboards)
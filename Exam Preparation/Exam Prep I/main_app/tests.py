@@ -1,3 +1,79 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+import pytest
+from django.core.cache import cache
+
+import caller
+from main_app import managers
+from main_app.models import Director, Actor, Movie
+
+
+@pytest.fixture
+def movies(db):
+    # The leaderboards are cached, so every test starts from a cold cache
+    cache.clear()
+
+    directors = [Director.objects.create(full_name=f'Director {i}') for i in range(2)]
+    actors = [Actor.objects.create(full_name=f'Actor {i}', is_awarded=i == 0) for i in range(4)]
+
+    for i in range(6):
+        movie = Movie.objects.create(
+            title=f'Movie {i}', release_date=date(2000 + i, 1, 1), rating=Decimal('7.5') + i % 3,
+            is_awarded=i % 2 == 0, is_classic=i < 3, director=directors[i % 2], starring_actor=actors[i % 4],
+        )
+        movie.actors.add(*actors[:i % 4 + 1])
+
+
+@pytest.mark.parametrize('func, args', [
+    (caller.get_directors, ('Director',)),
+    (caller.get_top_director, ()),
+    (caller.get_top_actor, ()),
+    (caller.get_actors_by_movies_count, ()),
+    (caller.get_top_rated_awarded_movie, ()),
+    (caller.increase_rating, ()),
+])
+def test_caller_query_budget(movies, query_budget, func, args):
+    query_budget(func, *args)
+
+
+def test_get_top_actor_builds_the_report_in_one_query(movies, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        result = caller.get_top_actor()
+
+    assert result == 'Top Actor: Actor 0, starring in movies: Movie 0, Movie 4, movies average rating: 8.0'
+
+
+def test_get_top_actor_query_count_does_not_grow_with_the_filmography(movies, django_assert_num_queries):
+    actor = Actor.objects.get(full_name='Actor 1')
+    director = Director.objects.first()
+    Movie.objects.bulk_create(
+        Movie(title=f'Sequel {i}', release_date=date(2010, 1, 1), director=director, starring_actor=actor)
+        for i in range(20)
+    )
+
+    with django_assert_num_queries(1):
+        result = caller.get_top_actor()
+
+    assert result.startswith('Top Actor: Actor 1, starring in movies: Movie 1, Movie 5, Sequel 0,')
+
+
+def test_increase_rating_stops_at_the_max_rating(movies):
+    Movie.objects.filter(title='Movie 0').update(rating=Decimal('10.0'))
+
+    assert caller.increase_rating() == 'Rating increased for 2 movies.'
+    assert list(Movie.objects.filter(is_classic=True).order_by('title').values_list('rating', flat=True)) == [
+        Decimal('10.0'), Decimal('8.6'), Decimal('9.6'),
+    ]
+
+
+def test_leaderboard_rebuild_after_a_timed_out_wait_keeps_the_holders_lock(movies, monkeypatch):
+    monkeypatch.setattr(managers, 'LEADERBOARD_LOCK_TTL', 0.1)
+    generation = cache.get_or_set(managers.LEADERBOARD_GENERATION_KEY, 0, None)
+    lock_key = f'leaderboards:directors:1:lock:{generation}'
+
+    # Another caller is still rebuilding the board
+    cache.add(lock_key, 1, 60)
+
+    assert caller.get_top_director() == 'Top Director: Director 0, movies: 3.'
+    assert cache.get(lock_key) == 1
@@ -1,7 +1,6 @@
 import os
 
 import django
-from django.db.models import Q, Count, F
 
 # Set up Django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
@@ -9,46 +8,35 @@ django.setup()
 
 # Import your models here
 from main_app.models import Profile, Product, Order
+from main_app.pricing import PricingEngine
+from reports import write_lines
 
 
 # Create queries within functions
-def get_profiles(search_string=None):
-    result = []
+def iter_profiles(search_string=None, chunk_size=2000):
     if search_string is None:
-        return ""
+        return
 
-    query = (
-        Q(full_name__icontains=search_string) |
-        Q(email__icontains=search_string) |
-        Q(phone_number__icontains=search_string)
-    )
+    profiles = Profile.objects.search(search_string)
 
-    profiles = Profile.objects.filter(query).order_by('full_name')
-
-    if not profiles.exists():
-        return ""
+    for profile in profiles.iterator(chunk_size=chunk_size):
+        yield (f"Profile: {profile.full_name}, "
+               f"email: {profile.email}, "
+               f"phone number: {profile.phone_number}, "
+               f"orders: {profile.order_count}")
 
-    for profile in profiles:
-        result.append(f"Profile: {profile.full_name}, "
-                      f"email: {profile.email}, "
-                      f"phone number: {profile.phone_number}, "
-                      f"orders: {profile.profile_orders.count()}")
 
-    return '\n'.join(result)
+def get_profiles(search_string=None):
+    return '\n'.join(iter_profiles(search_string))
 
 
 def get_loyal_profiles():
-    result = []
     loyal_profiles = Profile.objects.get_regular_customers()
 
-    if not loyal_profiles.exists():
-        return ""
-
-    for profile in loyal_profiles:
-        result.append(f"Profile: {profile.full_name}, "
-                      f"orders: {profile.order_count}")
-
-    return '\n'.join(result)
+    return '\n'.join(
+        f"Profile: {profile.full_name}, orders: {profile.order_count}"
+        for profile in loyal_profiles
+    )
 
 
 def get_last_sold_products():
@@ -63,55 +51,24 @@ def get_last_sold_products():
 
 
 def get_top_products():
-    top_products = Product.objects.annotate(
-        total_sales=Count('products_orders')
-    ).filter(
-        total_sales__gt=0
-    ).order_by(
-        '-total_sales',
-        'name'
-    )[:5]
-
-    if not top_products.exists():
-        return ""
+    top_products = Product.objects.get_top_products()
+
+    result = '\n'.join(f"{product.name}, sold {product.sales_count} times" for product in top_products)
 
-    result = '\n'.join(f"{product.name}, sold {product.total_sales} times" for product in top_products)
+    if not result:
+        return ""
 
     return f"Top products:\n{result}"
 
 
 def apply_discounts() -> str:
-    orders = Order.objects.annotate(
-        num_products=Count('products')
-    ).filter(
-        num_products__gt=2,
-        is_completed=False,
-    )
-
-    updated_orders = orders.update(total_price=F('total_price') * 0.9)
+    report = PricingEngine().apply()
 
-    return f"Discount applied to {updated_orders} orders."
+    return f"Discount applied to {report.orders} orders."
 
 
 def complete_order() -> str:
-    order = Order.objects.prefetch_related('products').filter(
-        is_completed=False
-    ).order_by(
-        'creation_date'
-    ).first()
-
-    if not order:
+    if not Order.objects.complete_pending():
         return ''
 
-    for product in order.products.all():
-        product.in_stock -= 1
-
-        if product.in_stock <= 0:
-            product.is_available = False
-
-        product.save()
-
-    order.is_completed = True
-    order.save()
-
     return "Order has been completed!"
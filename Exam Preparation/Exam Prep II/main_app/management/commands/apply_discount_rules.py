@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from main_app.pricing import PricingEngine, load_rules
+
+
+class Command(BaseCommand):
+    help = 'Reprices orders with a set of discount rules, one set-based UPDATE per primary key range.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rules', help='JSON file with a list of discount rules. Defaults to the built-in rules.')
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        rules = load_rules(options['rules']) if options['rules'] else None
+        report = PricingEngine(rules).apply(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Repriced {report.orders} orders in {report.seconds:.2f}s ({report.orders_per_second:.0f} orders/sec).'
+        ))
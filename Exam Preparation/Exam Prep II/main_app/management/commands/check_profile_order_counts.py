@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import Profile
+
+
+class Command(BaseCommand):
+    help = 'Reports profiles whose order_count drifted from their orders and optionally fixes them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true')
+
+    def handle(self, *args, **options):
+        drifted = Profile.objects.drifted()
+
+        for profile in drifted[:20]:
+            self.stdout.write(
+                f'{profile.full_name} (#{profile.pk}): stored {profile.order_count}, actual {profile.actual_order_count}'
+            )
+
+        total = drifted.count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS('All profile order counts are consistent.'))
+            return
+
+        if not options['fix']:
+            self.stdout.write(self.style.WARNING(f'{total} profiles have drifted. Run with --fix to repair them.'))
+            return
+
+        fixed = Profile.objects.rebuild_order_counts(Profile.objects.filter(pk__in=drifted.values('pk')))
+        self.stdout.write(self.style.SUCCESS(f'Fixed the order count of {fixed} profiles.'))
@@ -0,0 +1,60 @@
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from main_app.models import Order
+
+
+def work(batch_size, idle_sleep, run_forever, report_every):
+    connections.close_all()
+
+    completed = 0
+    start = last_report = time.perf_counter()
+
+    while True:
+        done = Order.objects.complete_pending(batch_size)
+        completed += done
+
+        now = time.perf_counter()
+        if now - last_report >= report_every:
+            print(f"[worker {multiprocessing.current_process().name}] {completed} orders, "
+                  f"{completed / (now - start):.0f} orders/sec", flush=True)
+            last_report = now
+
+        if not done:
+            if not run_forever:
+                break
+            time.sleep(idle_sleep)
+
+    return completed, time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = 'Completes open orders in batches, claiming them with SELECT ... FOR UPDATE SKIP LOCKED.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--forever', action='store_true', help='Keep polling when no open orders are left.')
+        parser.add_argument('--idle-sleep', type=float, default=1.0)
+        parser.add_argument('--report-every', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        params = (options['batch_size'], options['idle_sleep'], options['forever'], options['report_every'])
+
+        start = time.perf_counter()
+        if options['processes'] == 1:
+            results = [work(*params)]
+        else:
+            connections.close_all()
+            with multiprocessing.get_context('fork').Pool(options['processes']) as pool:
+                results = pool.starmap(work, [params] * options['processes'])
+        elapsed = time.perf_counter() - start
+
+        completed = sum(count for count, _ in results)
+        self.stdout.write(self.style.SUCCESS(
+            f"Completed {completed} orders with {options['processes']} processes in {elapsed:.2f}s "
+            f"({completed / elapsed if elapsed else 0:.0f} orders/sec)."
+        ))
@@ -0,0 +1,26 @@
+import csv
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from main_app.models import Order
+
+
+def read_records(path):
+    # Rows are "profile_id,product_ids,total_price" with the product ids separated by spaces
+    with open(path, newline='') as file:
+        for profile_id, product_ids, total_price in csv.reader(file):
+            yield int(profile_id), [int(pk) for pk in product_ids.split()], Decimal(total_price)
+
+
+class Command(BaseCommand):
+    help = ('Streams orders from a CSV file and loads them in batches with COPY on PostgreSQL, '
+            'falling back to bulk_create on other databases.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        total = Order.objects.ingest(read_records(options['path']), options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Ingested {total} orders.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the sales_count counter of all products from the order lines.'
+
+    def handle(self, *args, **options):
+        updated = Product.objects.rebuild_sales_counts()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt sales counts for {updated} products.'))
@@ -1,13 +1,298 @@
-from django.db.models import Manager, Count
+import csv
+import io
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Manager, Count, Q, F, OuterRef, Subquery, Case, When, Value
+from django.db.models.functions import Greatest, Coalesce
+from django.utils import timezone
+
+TOP_PRODUCTS_TTL = 60
+TOP_PRODUCTS_GENERATION_KEY = 'top_products:generation'
+
+
+def reserve_pks(model, count):
+    table = model._meta.db_table
+    column = model._meta.pk.column
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+            [table, column, count]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def copy_rows(model, field_names, rows):
+    # COPY skips the per-object work of bulk_create, which dominates when loading millions of rows
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(name).column) for name in field_names)
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='\n').writerows(rows)
+    buffer.seek(0)
+
+    # CSV quoting covers delimiters, quotes and newlines in the values, an unquoted empty field is NULL
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f'COPY {quote(model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+
+def group_by_increment(counter):
+    groups = defaultdict(list)
+    for pk, increment in counter.items():
+        groups[increment].append(pk)
+
+    return groups.items()
 
 
 class ProfileManager(Manager):
 
+    def search(self, search_string, after=None, limit=None):
+        # icontains compiles to UPPER(col) LIKE UPPER(...), which the trigram indexes on UPPER(col) cover
+        profiles = self.filter(
+            Q(full_name__icontains=search_string) |
+            Q(email__icontains=search_string) |
+            Q(phone_number__icontains=search_string)
+        ).order_by(
+            'full_name',
+            'id'
+        )
+
+        if after is not None:
+            full_name, pk = after
+            profiles = profiles.filter(
+                Q(full_name__gt=full_name) | Q(full_name=full_name, id__gt=pk)
+            )
+
+        return profiles[:limit] if limit is not None else profiles
+
+    def search_page(self, search_string, after=None, page_size=50):
+        profiles = list(self.search(search_string, after, page_size))
+        next_after = (profiles[-1].full_name, profiles[-1].pk) if len(profiles) == page_size else None
+
+        return profiles, next_after
+
     def get_regular_customers(self):
-        return self.annotate(
-            order_count=Count('profile_orders')
-        ).filter(
+        # Only the columns covered by the partial index are loaded, so it can answer this without the heap
+        return self.filter(
             order_count__gt=2
         ).order_by(
             '-order_count'
+        ).only(
+            'full_name',
+            'order_count'
         )
+
+    def change_order_count(self, profile_ids, delta):
+        return self.filter(pk__in=profile_ids).update(order_count=F('order_count') + delta)
+
+    def actual_order_count(self):
+        orders = self.model.profile_orders.field.model.objects.filter(
+            profile_id=OuterRef('pk')
+        ).values('profile_id').annotate(
+            total=Count('*')
+        ).values('total')
+
+        return Coalesce(Subquery(orders), 0)
+
+    def drifted(self):
+        return self.annotate(
+            actual_order_count=self.actual_order_count()
+        ).exclude(
+            order_count=F('actual_order_count')
+        )
+
+    def rebuild_order_counts(self, queryset=None):
+        queryset = queryset if queryset is not None else self.all()
+
+        return queryset.update(order_count=self.actual_order_count())
+
+
+class ProductManager(Manager):
+
+    def get_top_products(self, limit=5):
+        return self.filter(
+            sales_count__gt=0
+        ).order_by(
+            '-sales_count',
+            'name'
+        )[:limit]
+
+    def get_cached_top_products(self, limit=5):
+        # Bumping the generation invalidates the cached lists for every limit at once
+        generation = cache.get_or_set(TOP_PRODUCTS_GENERATION_KEY, 0, None)
+        key = f'top_products:{generation}:{limit}'
+
+        top_products = cache.get(key)
+        if top_products is None:
+            top_products = list(self.get_top_products(limit).values('id', 'name', 'sales_count'))
+            cache.set(key, top_products, TOP_PRODUCTS_TTL)
+
+        return top_products
+
+    def invalidate_top_products(self):
+        try:
+            cache.incr(TOP_PRODUCTS_GENERATION_KEY)
+        except ValueError:
+            cache.set(TOP_PRODUCTS_GENERATION_KEY, 1, None)
+
+    def change_sales_count(self, product_ids, delta):
+        updated = self.filter(pk__in=product_ids).update(sales_count=F('sales_count') + delta)
+
+        # Bumped after commit, or a concurrent reader could cache the old counts under the new generation
+        transaction.on_commit(self.invalidate_top_products)
+
+        return updated
+
+    def rebuild_sales_counts(self):
+        through = self.model.products_orders.through
+
+        sold = through.objects.filter(
+            product_id=OuterRef('pk')
+        ).values('product_id').annotate(
+            total=Count('*')
+        ).values('total')
+
+        updated = self.update(sales_count=Coalesce(Subquery(sold), 0))
+        transaction.on_commit(self.invalidate_top_products)
+
+        return updated
+
+
+class OrderManager(Manager):
+
+    def ingest(self, records, batch_size=5000):
+        total = 0
+        batch = []
+
+        for record in records:
+            batch.append(record)
+
+            if len(batch) == batch_size:
+                total += self._ingest_batch(batch)
+                batch = []
+
+        if batch:
+            total += self._ingest_batch(batch)
+
+        return total
+
+    def _ingest_batch(self, records):
+        through = self.model.products.through
+        product_model = self.model.products.field.related_model
+        profile_model = self.model.profile.field.related_model
+
+        with transaction.atomic():
+            self._check_related_ids(records)
+
+            if connection.vendor == 'postgresql':
+                order_ids = reserve_pks(self.model, len(records))
+                now = timezone.now()
+                copy_rows(self.model, ('id', 'profile', 'total_price', 'is_completed', 'creation_date'), (
+                    (order_id, profile_id, total_price, False, now.isoformat())
+                    for order_id, (profile_id, _, total_price) in zip(order_ids, records)
+                ))
+                copy_rows(through, ('order', 'product'), (
+                    (order_id, product_id)
+                    for order_id, (_, product_ids, _) in zip(order_ids, records)
+                    for product_id in set(product_ids)
+                ))
+            else:
+                orders = self.bulk_create(
+                    self.model(profile_id=profile_id, total_price=total_price)
+                    for profile_id, _, total_price in records
+                )
+                order_ids = [order.pk for order in orders]
+                through.objects.bulk_create(
+                    through(order_id=order_id, product_id=product_id)
+                    for order_id, (_, product_ids, _) in zip(order_ids, records)
+                    for product_id in set(product_ids)
+                )
+
+            # Neither path sends signals, so the sales and order counters are bumped here,
+            # with one UPDATE per distinct increment instead of one per row
+            sold = Counter(product_id for _, product_ids, _ in records for product_id in set(product_ids))
+            for increment, product_ids in group_by_increment(sold):
+                product_model.objects.filter(pk__in=product_ids).update(sales_count=F('sales_count') + increment)
+
+            placed = Counter(profile_id for profile_id, _, _ in records)
+            for increment, profile_ids in group_by_increment(placed):
+                profile_model.objects.change_order_count(profile_ids, increment)
+
+        product_model.objects.invalidate_top_products()
+
+        return len(order_ids)
+
+    def _check_related_ids(self, records):
+        product_model = self.model.products.field.related_model
+        profile_model = self.model.profile.field.related_model
+
+        profile_ids = {profile_id for profile_id, _, _ in records}
+        product_ids = {product_id for _, product_ids, _ in records for product_id in product_ids}
+
+        # One query for both tables, so a bad id fails the batch the same way on either load path
+        # instead of as a foreign key error from the middle of a COPY
+        found = set(profile_model.objects.filter(
+            pk__in=profile_ids
+        ).annotate(
+            kind=Value('profile')
+        ).values_list('kind', 'pk').union(
+            product_model.objects.filter(
+                pk__in=product_ids
+            ).annotate(
+                kind=Value('product')
+            ).values_list('kind', 'pk'),
+            all=True
+        ))
+
+        missing = {('profile', pk) for pk in profile_ids} | {('product', pk) for pk in product_ids}
+        missing -= found
+
+        if missing:
+            raise ValueError('Unknown ids: ' + ', '.join(f'{kind} {pk}' for kind, pk in sorted(missing)))
+
+    def complete_pending(self, batch_size=1):
+        with transaction.atomic():
+            # Rows locked by another worker are skipped instead of waited on
+            order_ids = list(
+                self.filter(
+                    is_completed=False
+                ).order_by(
+                    'creation_date'
+                ).select_for_update(
+                    skip_locked=True
+                ).values_list('pk', flat=True)[:batch_size]
+            )
+
+            if not order_ids:
+                return 0
+
+            through = self.model.products.through
+            product_model = self.model.products.field.related_model
+
+            sold = through.objects.filter(
+                order_id__in=order_ids,
+                product_id=OuterRef('pk')
+            ).values('product_id').annotate(
+                total=Count('*')
+            ).values('total')
+
+            products = product_model.objects.filter(
+                pk__in=through.objects.filter(order_id__in=order_ids).values('product_id')
+            )
+
+            # Lock the products in a fixed order so concurrent batches cannot deadlock in the UPDATE
+            list(products.order_by('pk').select_for_update().values_list('pk', flat=True))
+
+            # Like the per-product save it replaces, this only ever marks a product unavailable
+            products.update(
+                in_stock=Greatest(F('in_stock') - Subquery(sold), 0),
+                is_available=Case(
+                    When(in_stock__lte=Subquery(sold), then=Value(False)),
+                    default=F('is_available'),
+                ),
+            )
+
+            self.filter(pk__in=order_ids).update(is_completed=True)
+
+        return len(order_ids)
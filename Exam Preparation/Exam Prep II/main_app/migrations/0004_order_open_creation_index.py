@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_profile_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['creation_date'], name='order_open_creation_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:23
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_sales_count(apps, schema_editor):
+    Product = apps.get_model('main_app', 'Product')
+    Order = apps.get_model('main_app', 'Order')
+
+    sold = Order.products.through.objects.filter(
+        product_id=models.OuterRef('pk')
+    ).values('product_id').annotate(total=models.Count('*')).values('total')
+
+    Product.objects.update(sales_count=Coalesce(models.Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_order_open_creation_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='sales_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-sales_count', 'name'], name='product_sales_count_idx'),
+        ),
+        migrations.RunPython(fill_sales_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:32
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_order_count(apps, schema_editor):
+    Profile = apps.get_model('main_app', 'Profile')
+    Order = apps.get_model('main_app', 'Order')
+
+    orders = Order.objects.filter(
+        profile_id=OuterRef('pk')
+    ).values('profile_id').annotate(
+        total=Count('*')
+    ).values('total')
+
+    Profile.objects.update(order_count=Coalesce(Subquery(orders), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_product_sales_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='order_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_order_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('order_count__gt', 2)), fields=['-order_count'], include=('full_name', 'id'), name='profile_loyal_idx'),
+        ),
+    ]
@@ -1,6 +1,8 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinLengthValidator, MaxLengthValidator, MinValueValidator, MaxValueValidator
 from django.db import models
-from .managers import ProfileManager
+from django.db.models.functions import Upper
+from .managers import ProfileManager, ProductManager, OrderManager
 
 
 # Create your models here.
@@ -23,9 +25,24 @@ class Profile(CreationDateMixin):
     )
     address = models.TextField()
     is_active = models.BooleanField(default=True)
+    order_count = models.PositiveIntegerField(default=0, editable=False)
 
     objects = ProfileManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-order_count'],
+                include=['full_name', 'id'],
+                condition=models.Q(order_count__gt=2),
+                name='profile_loyal_idx',
+            ),
+            models.Index(fields=['full_name', 'id'], name='profile_name_id_idx'),
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='profile_name_trgm_idx'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='profile_email_trgm_idx'),
+            GinIndex(OpClass(Upper('phone_number'), name='gin_trgm_ops'), name='profile_phone_trgm_idx'),
+        ]
+
     def __str__(self):
         return self.full_name
 
@@ -45,6 +62,14 @@ class Product(CreationDateMixin):
         validators=[MinValueValidator(0)],
     )
     is_available = models.BooleanField(default=True)
+    sales_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ProductManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-sales_count', 'name'], name='product_sales_count_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -59,3 +84,14 @@ class Order(CreationDateMixin):
         validators=[MinValueValidator(0.01), MaxValueValidator(10)],
     )
     is_completed = models.BooleanField(default=False)
+
+    objects = OrderManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['creation_date'],
+                condition=models.Q(is_completed=False),
+                name='order_open_creation_idx',
+            ),
+        ]
@@ -0,0 +1,124 @@
+import json
+import time
+from decimal import Decimal
+
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models import Q, F, Case, When, Value, Count, OuterRef, Subquery, DecimalField, Min, Max
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.db.models.lookups import GreaterThanOrEqual, LessThanOrEqual
+
+from main_app.models import Order
+
+
+class DiscountRule:
+    def __init__(self, name, percent, min_products=None, max_products=None,
+                 min_total=None, max_total=None, include_completed=False):
+        self.name = name
+        self.percent = Decimal(str(percent))
+        self.min_products = min_products
+        self.max_products = max_products
+        self.min_total = min_total
+        self.max_total = max_total
+        self.include_completed = include_completed
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    @property
+    def factor(self):
+        return (100 - self.percent) / 100
+
+    def condition(self, product_count):
+        conditions = []
+
+        if not self.include_completed:
+            conditions.append(Q(is_completed=False))
+        if self.min_products is not None:
+            conditions.append(GreaterThanOrEqual(product_count, self.min_products))
+        if self.max_products is not None:
+            conditions.append(LessThanOrEqual(product_count, self.max_products))
+        if self.min_total is not None:
+            conditions.append(Q(total_price__gte=self.min_total))
+        if self.max_total is not None:
+            conditions.append(Q(total_price__lte=self.max_total))
+
+        return Q(*conditions)
+
+
+DEFAULT_DISCOUNT_RULES = [
+    DiscountRule('more than two products', percent=10, min_products=3),
+]
+
+
+def load_rules(path):
+    with open(path) as file:
+        return [DiscountRule.from_dict(data) for data in json.load(file)]
+
+
+def validator_limits(field):
+    lower = next(v.limit_value for v in field.validators if isinstance(v, MinValueValidator))
+    upper = next(v.limit_value for v in field.validators if isinstance(v, MaxValueValidator))
+
+    return Decimal(str(lower)), Decimal(str(upper))
+
+
+class PricingReport:
+    def __init__(self, orders, seconds):
+        self.orders = orders
+        self.seconds = seconds
+
+    @property
+    def orders_per_second(self):
+        return self.orders / self.seconds if self.seconds else 0.0
+
+
+class PricingEngine:
+    def __init__(self, rules=None):
+        self.rules = rules if rules is not None else DEFAULT_DISCOUNT_RULES
+
+    def product_count(self):
+        return Coalesce(Subquery(
+            Order.products.through.objects.filter(
+                order_id=OuterRef('pk')
+            ).values('order_id').annotate(
+                total=Count('*')
+            ).values('total')
+        ), 0)
+
+    def new_price(self):
+        field = Order._meta.get_field('total_price')
+        lower, upper = validator_limits(field)
+        output_field = DecimalField(max_digits=field.max_digits, decimal_places=field.decimal_places)
+
+        # The first matching rule wins, and the validator bounds are enforced in SQL instead of full_clean()
+        price = Case(
+            *(When(rule.condition(self.product_count()), then=F('total_price') * rule.factor) for rule in self.rules),
+            default=F('total_price'),
+            output_field=output_field,
+        )
+
+        return Greatest(Least(price, Value(upper)), Value(lower), output_field=output_field)
+
+    def apply(self, queryset=None, batch_size=10000):
+        queryset = queryset if queryset is not None else Order.objects.all()
+        matches = Q()
+        for rule in self.rules:
+            matches |= rule.condition(self.product_count())
+
+        start = time.perf_counter()
+        updated = 0
+
+        if self.rules:
+            bounds = queryset.aggregate(first=Min('pk'), last=Max('pk'))
+
+            if bounds['first'] is not None:
+                # One UPDATE per primary key range keeps every statement's locks bounded
+                for low in range(bounds['first'], bounds['last'] + 1, batch_size):
+                    updated += queryset.filter(
+                        matches,
+                        pk__gte=low,
+                        pk__lt=low + batch_size,
+                    ).update(total_price=self.new_price())
+
+        return PricingReport(updated, time.perf_counter() - start)
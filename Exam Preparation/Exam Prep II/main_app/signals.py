@@ -0,0 +1,80 @@
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from main_app.models import Order, Product, Profile
+
+
+def linked_pk_set(through, instance, reverse, pk_set):
+    if reverse:
+        links = through.objects.filter(product_id=instance.pk, order_id__in=pk_set)
+        return set(links.values_list('order_id', flat=True))
+
+    links = through.objects.filter(order_id=instance.pk, product_id__in=pk_set)
+    return set(links.values_list('product_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Order.products.through)
+def update_sales_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # pk_set is not provided on clear, so collect the related ids before they are gone
+        if reverse:
+            pk_set = set(instance.products_orders.values_list('pk', flat=True))
+        else:
+            pk_set = set(instance.products.values_list('pk', flat=True))
+        delta = -1
+    elif action == 'pre_remove':
+        # pk_set holds the ids the caller asked to remove, only the linked ones lose a sale
+        instance._removed_pk_set = linked_pk_set(sender, instance, reverse, pk_set)
+        return
+    elif action == 'post_add':
+        delta = 1
+    elif action == 'post_remove':
+        pk_set = getattr(instance, '_removed_pk_set', set())
+        delta = -1
+    else:
+        return
+
+    if not pk_set:
+        return
+
+    if reverse:
+        Product.objects.change_sales_count([instance.pk], delta * len(pk_set))
+    else:
+        Product.objects.change_sales_count(pk_set, delta)
+
+
+@receiver(pre_delete, sender=Order)
+def release_order_products(sender, instance, **kwargs):
+    # The m2m rows are removed by the delete cascade without firing m2m_changed
+    product_ids = list(instance.products.values_list('pk', flat=True))
+
+    if product_ids:
+        Product.objects.change_sales_count(product_ids, -1)
+
+
+@receiver(pre_save, sender=Order)
+def remember_original_profile(sender, instance, **kwargs):
+    instance._old_profile_id = None
+
+    if instance.pk:
+        instance._old_profile_id = Order.objects.filter(
+            pk=instance.pk
+        ).values_list('profile_id', flat=True).first()
+
+
+@receiver(post_save, sender=Order)
+def update_order_count(sender, instance, **kwargs):
+    old_profile_id = getattr(instance, '_old_profile_id', None)
+
+    if old_profile_id == instance.profile_id:
+        return
+
+    if old_profile_id:
+        Profile.objects.change_order_count([old_profile_id], -1)
+
+    Profile.objects.change_order_count([instance.profile_id], 1)
+
+
+@receiver(post_delete, sender=Order)
+def release_order_profile(sender, instance, **kwargs):
+    Profile.objects.change_order_count([instance.profile_id], -1)
@@ -1,3 +1,118 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+import pytest
+from django.core.cache import cache
+
+import caller
+from main_app.models import Profile, Product, Order
+
+
+@pytest.fixture
+def orders(db):
+    profiles = [
+        Profile.objects.create(
+            full_name=f'Customer {i}', email=f'customer{i}@example.com', phone_number=f'0888{i:06d}', address='Sofia'
+        )
+        for i in range(3)
+    ]
+    products = [
+        Product.objects.create(name=f'Product {i}', description='Description', price=Decimal('5.00'), in_stock=10)
+        for i in range(4)
+    ]
+
+    for i in range(9):
+        order = Order.objects.create(profile=profiles[i % 2], total_price=Decimal('9.00'))
+        order.products.add(*products[:i % 4 + 1])
+
+
+@pytest.mark.parametrize('func, args', [
+    (caller.get_profiles, ('Customer',)),
+    (caller.get_loyal_profiles, ()),
+    (caller.get_last_sold_products, ()),
+    (caller.get_top_products, ()),
+    (caller.apply_discounts, ()),
+])
+def test_caller_query_budget(orders, query_budget, func, args):
+    query_budget(func, *args)
+
+
+def test_complete_order_query_budget(transactional_db, orders, query_budget):
+    # A transactional test, since the savepoints of a wrapping test transaction would be counted too
+    assert query_budget(caller.complete_order) == 'Order has been completed!'
+
+
+def test_remove_of_a_non_member_keeps_the_sales_count(db):
+    profile = Profile.objects.create(
+        full_name='Customer', email='customer@example.com', phone_number='0888000000', address='Sofia'
+    )
+    member, outsider = [
+        Product.objects.create(name=name, description='Description', price=Decimal('5.00'), in_stock=10)
+        for name in ('Member', 'Outsider')
+    ]
+    order = Order.objects.create(profile=profile, total_price=Decimal('9.00'))
+    other_order = Order.objects.create(profile=profile, total_price=Decimal('9.00'))
+    order.products.add(member)
+    other_order.products.add(outsider)
+
+    order.products.remove(outsider)
+    order.products.remove(outsider, member)
+    outsider.products_orders.remove(order)
+
+    member.refresh_from_db()
+    outsider.refresh_from_db()
+    assert (member.sales_count, outsider.sales_count) == (0, 1)
+
+
+def test_top_products_cache_is_invalidated_after_commit(orders, django_capture_on_commit_callbacks):
+    cache.clear()
+    cached = Product.objects.get_cached_top_products()
+    order = Order.objects.create(profile=Profile.objects.first(), total_price=Decimal('9.00'))
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        order.products.add(Product.objects.get(name='Product 3'))
+
+        # Until the sale commits, readers keep getting the cached list
+        assert Product.objects.get_cached_top_products() == cached
+
+    for callback in callbacks:
+        callback()
+
+    assert Product.objects.get_cached_top_products() != cached
+
+
+def test_complete_order_keeps_unavailable_products_unavailable(transactional_db):
+    profile = Profile.objects.create(
+        full_name='Customer', email='customer@example.com', phone_number='0888000000', address='Sofia'
+    )
+    withdrawn, last_one = [
+        Product.objects.create(
+            name=name, description='Description', price=Decimal('5.00'), in_stock=in_stock, is_available=is_available
+        )
+        for name, in_stock, is_available in (('Withdrawn', 5, False), ('Last one', 1, True))
+    ]
+    order = Order.objects.create(profile=profile, total_price=Decimal('9.00'))
+    order.products.add(withdrawn, last_one)
+
+    caller.complete_order()
+
+    withdrawn.refresh_from_db()
+    last_one.refresh_from_db()
+    assert (withdrawn.in_stock, withdrawn.is_available) == (4, False)
+    assert (last_one.in_stock, last_one.is_available) == (0, False)
+
+
+def test_ingest_loads_orders_and_rejects_unknown_ids(orders):
+    profile = Profile.objects.first()
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True)[:2])
+    order_count = Order.objects.count()
+
+    assert Order.objects.ingest([(profile.pk, product_ids, Decimal('10.50'))]) == 1
+
+    order = Order.objects.latest('pk')
+    assert (order.profile_id, order.total_price, order.is_completed) == (profile.pk, Decimal('10.50'), False)
+    assert sorted(order.products.values_list('pk', flat=True)) == product_ids
+
+    with pytest.raises(ValueError, match='Unknown ids: product 0, profile 0'):
+        Order.objects.ingest([(profile.pk, product_ids, Decimal('1.00')), (0, [0], Decimal('1.00'))])
+
+    assert Order.objects.count() == order_count + 1
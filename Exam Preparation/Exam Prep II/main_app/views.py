@@ -1,3 +1,13 @@
-from django.shortcuts import render
+from django.http import JsonResponse
+
+from main_app.models import Product
+
 
 # Create your views here.
+def top_products(request):
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 5)), 100))
+    except ValueError:
+        limit = 5
+
+    return JsonResponse({'top_products': Product.objects.get_cached_top_products(limit)})
@@ -17,6 +17,9 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 
+from main_app import views
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('products/top/', views.top_products, name='top-products'),
 ]
@@ -1,13 +1,14 @@
 import os
 
 import django
-from django.db.models import Q, Count, Avg
+from django.db.models import Q
 
 # Set up Django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
 
 # Import your models here
+from main_app import banning
 from main_app.models import Author, Article
 
 
@@ -49,15 +50,11 @@ def get_top_publisher():
     if author is None or not author.article_count:
         return ""
 
-    return f'Top Author: {author.full_name} with {author.authors_articles.count()} published articles.'
+    return f'Top Author: {author.full_name} with {author.article_count} published articles.'
 
 
 def get_top_reviewer():
-    author = (Author.objects.
-              prefetch_related('author_reviews').
-              annotate(review_count=Count('author_reviews')).
-              order_by('-review_count', 'email').
-              first())
+    author = Author.objects.get_authors_by_review_count().first()
 
     if author is None or not author.review_count:
         return ''
@@ -67,54 +64,51 @@ def get_top_reviewer():
 
 # Django Queries II
 def get_latest_article():
-    article = (Article.objects.
-               prefetch_related('article_reviews').
-               annotate(avg_reviews_rating=Avg('article_reviews__rating')).
-               order_by('-published_on').
-               first())
+    article = Article.objects.get_latest()
 
     if article is None:
         return ''
 
-    avg_rating = article.article_reviews.aggregate(Avg('rating'))['rating__avg']
-    avg_rating = 0 if avg_rating is None else avg_rating
+    avg_rating = 0 if article.avg_rating is None else article.avg_rating
 
-    authors_list = ', '.join(a.full_name for a in article.authors.all().order_by('full_name'))
+    authors_list = ', '.join(a.full_name for a in article.authors.all())
 
     return (f'The latest article is: {article.title}. '
             f'Authors: {authors_list}. '
-            f'Reviewed: {article.article_reviews.count()} times. '
+            f'Reviewed: {article.review_count} times. '
             f'Average Rating: {avg_rating:.2f}.')
 
 
 def get_top_rated_article():
-    article = (Article.objects.
-               prefetch_related('article_reviews').
-               annotate(avg_reviews_rating=Avg('article_reviews__rating')).
-               exclude(avg_reviews_rating__isnull=True).
-               order_by('-avg_reviews_rating', 'title').
-               first())
+    article = Article.objects.get_top_rated()
 
     if article is None:
         return ''
 
     return (f"The top-rated article is: {article.title},"
-            f" with an average rating of {article.avg_reviews_rating:.2f},"
-            f" reviewed {article.article_reviews.count()} times.")
+            f" with an average rating of {article.avg_rating:.2f},"
+            f" reviewed {article.review_count} times.")
 
 
 def ban_author(email=None):
     if email is None:
         return "No authors banned."
 
-    author = Author.objects.prefetch_related("author_reviews").filter(email=email).first()
+    report = banning.ban_author(email)
 
-    if author is None:
+    if report is None:
         return "No authors banned."
 
-    num_reviews = author.author_reviews.count()
-    author.is_banned = True
-    author.author_reviews.all().delete()
-    author.save()
+    return f"Author: {report.full_name} is banned! {report.reviews} reviews deleted."
 
-    return f"Author: {author.full_name} is banned! {num_reviews} reviews deleted."
+
+def search_articles(query, category=None, limit=10):
+    articles = Article.objects.search(query, category, limit).only('title', 'category')
+
+    result = []
+    for article in articles:
+        result.append(f'Article: {article.title} ({article.category}), '
+                      f'rank: {article.rank:.3f}. '
+                      f'{article.headline}')
+
+    return '\n'.join(result)
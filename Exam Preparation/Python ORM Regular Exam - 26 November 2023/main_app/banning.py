@@ -0,0 +1,139 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, transaction
+from django.db.models.signals import pre_delete, post_delete
+
+from main_app.models import Author, Review
+
+_ban_executor = None
+_ban_executor_lock = threading.Lock()
+
+
+def ban_executor():
+    global _ban_executor
+
+    # Created on the first background ban, so importing the module does not start a thread pool
+    with _ban_executor_lock:
+        if _ban_executor is None:
+            _ban_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ban-author")
+
+        return _ban_executor
+
+
+class BanReport:
+    def __init__(self, author_id, full_name):
+        self.author_id = author_id
+        self.full_name = full_name
+        self.reviews = 0
+        self.batches = 0
+        self.longest_batch = 0.0
+        self.seconds = 0.0
+
+    @property
+    def reviews_per_second(self):
+        return self.reviews / self.seconds if self.seconds else 0.0
+
+
+def raw_delete_allowed():
+    # The review stats are kept by a delete trigger, so the raw path is safe while nothing listens to review deletes
+    return not pre_delete.has_listeners(Review) and not post_delete.has_listeners(Review)
+
+
+def mark_banned(email):
+    quote = connection.ops.quote_name
+    meta = Author._meta
+    pk, full_name, email_column, is_banned = (
+        quote(meta.get_field(name).column) for name in ("id", "full_name", "email", "is_banned")
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {quote(meta.db_table)} SET {is_banned} = true "
+            f"WHERE {email_column} = %s RETURNING {pk}, {full_name}",
+            [email]
+        )
+
+        # Author.email is unique, so at most one author is banned
+        return cursor.fetchone()
+
+
+def raw_delete_batch(author_id, last_pk, batch_size):
+    quote = connection.ops.quote_name
+    meta = Review._meta
+    reviews = quote(meta.db_table)
+    pk = quote(meta.pk.column)
+    author = quote(meta.get_field("author").column)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH deleted AS ("
+            f"DELETE FROM {reviews} WHERE {pk} IN ("
+            f"SELECT {pk} FROM {reviews} WHERE {author} = %s AND {pk} > %s ORDER BY {pk} LIMIT %s"
+            f") RETURNING {pk}"
+            f") "
+            f"SELECT count(*), max({pk}) FROM deleted",
+            [author_id, last_pk, batch_size]
+        )
+        return cursor.fetchone()
+
+
+def collector_delete_batch(author_id, last_pk, batch_size):
+    pks = list(
+        Review.objects.filter(author_id=author_id, pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:batch_size]
+    )
+
+    if not pks:
+        return 0, None
+
+    Review.objects.filter(pk__in=pks).delete()
+
+    return len(pks), pks[-1]
+
+
+def delete_reviews(report, batch_size=5000, on_progress=None, lock_timeout="1s"):
+    delete_batch = raw_delete_batch if raw_delete_allowed() else collector_delete_batch
+    start = time.perf_counter()
+    last_pk = 0
+
+    while True:
+        batch_start = time.perf_counter()
+
+        # Each batch is its own short transaction, so locks are only held for batch_size reviews at a time
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", [lock_timeout])
+            deleted, last_pk = delete_batch(report.author_id, last_pk, batch_size)
+
+        report.reviews += deleted
+        report.batches += 1
+        report.longest_batch = max(report.longest_batch, time.perf_counter() - batch_start)
+        report.seconds = time.perf_counter() - start
+
+        if on_progress:
+            on_progress(report)
+
+        if deleted < batch_size:
+            return report
+
+
+def delete_reviews_in_thread(report, batch_size, on_progress, lock_timeout):
+    try:
+        return delete_reviews(report, batch_size, on_progress, lock_timeout)
+    finally:
+        connection.close()
+
+
+def ban_author(email, batch_size=5000, on_progress=None, lock_timeout="1s", background=False, executor=None):
+    banned = mark_banned(email)
+
+    if banned is None:
+        return None
+
+    # The author is banned from here on, only the review cleanup is left
+    report = BanReport(*banned)
+
+    if background:
+        return (executor or ban_executor()).submit(delete_reviews_in_thread, report, batch_size, on_progress, lock_timeout)
+
+    return delete_reviews(report, batch_size, on_progress, lock_timeout)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main_app.banning import ban_author
+
+
+class Command(BaseCommand):
+    help = 'Bans an author at once, then deletes their reviews in short primary key ordered batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('email')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--lock-timeout', default='1s')
+
+    def handle(self, *args, **options):
+        report = ban_author(
+            options['email'],
+            batch_size=options['batch_size'],
+            on_progress=self.write_progress if options['verbosity'] > 1 else None,
+            lock_timeout=options['lock_timeout'],
+        )
+
+        if report is None:
+            raise CommandError(f"No author with the email {options['email']}.")
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Banned {report.full_name} and deleted {report.reviews} reviews in {report.batches} batches, '
+            f'{report.seconds:.2f}s ({report.reviews_per_second:.0f} reviews/sec, '
+            f'longest batch {report.longest_batch * 1000:.0f}ms).'
+        ))
+
+    def write_progress(self, report):
+        self.stdout.write(f'{report.reviews} reviews deleted ({report.reviews_per_second:.0f} reviews/sec)')
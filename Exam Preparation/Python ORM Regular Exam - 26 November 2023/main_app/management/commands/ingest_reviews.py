@@ -0,0 +1,32 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from main_app.models import Review
+
+
+def read_rows(path):
+    # Rows are "author_id,article_id,rating,content", with a header line
+    with open(path, newline='', encoding='utf-8') as file:
+        yield from csv.DictReader(file)
+
+
+class Command(BaseCommand):
+    help = 'Validates reviews from a CSV file in batches and bulk loads the valid ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--show-errors', type=int, default=20, help='How many rejected rows to print.')
+
+    def handle(self, *args, **options):
+        report = Review.objects.ingest(read_rows(options['path']), options['batch_size'])
+
+        for row_number, row_errors in list(report.errors.items())[:options['show_errors']]:
+            details = '; '.join(f'{field}: {" ".join(messages)}' for field, messages in row_errors.items())
+            self.stdout.write(self.style.WARNING(f'Row {row_number + 1}: {details}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {report.loaded} of {report.rows} reviews, rejected {len(report.errors)}, '
+            f'in {report.seconds:.2f}s ({report.rows_per_second:.0f} rows/sec).'
+        ))
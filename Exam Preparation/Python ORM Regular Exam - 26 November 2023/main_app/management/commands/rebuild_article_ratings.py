@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the review count and rating sum of every article from its reviews.'
+
+    def handle(self, *args, **options):
+        updated = Article.objects.rebuild_review_stats()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the review stats of {updated} articles.'))
@@ -1,11 +1,170 @@
-from django.db import models
-from django.db.models import Count
+import time
+from collections import defaultdict
 
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchHeadline
+from django.db import connection, models, transaction
+from django.db.models import Count, Sum, F, OuterRef, Subquery, Prefetch, ExpressionWrapper
+from django.db.models.functions import Coalesce, NullIf
+
+SEARCH_CONFIG = "english"
+
+
+def average_rating():
+    # Shared with the functional index on Article, the planner only uses it for the identical expression
+    return ExpressionWrapper(
+        F("rating_sum") / NullIf(F("review_count"), 0),
+        output_field=models.FloatField(),
+    )
+
+
+class AuthorQuerySet(models.QuerySet):
+    # Related rows are only prefetched on request, for callers that iterate over them
+    def with_articles(self):
+        return self.prefetch_related("authors_articles")
+
+    def with_reviews(self):
+        return self.prefetch_related("author_reviews")
 
-class AuthorManager(models.Manager):
     def get_authors_by_article_count(self):
         return (self.
-                prefetch_related("authors_articles").
                 annotate(article_count=Count("authors_articles")).
                 order_by("-article_count", "email")
                 )
+
+    def get_authors_by_review_count(self):
+        return (self.
+                annotate(review_count=Count("author_reviews")).
+                order_by("-review_count", "email")
+                )
+
+
+class ArticleManager(models.Manager):
+    def get_latest(self):
+        from main_app.models import Author
+
+        return (self.
+                annotate(avg_rating=average_rating()).
+                prefetch_related(Prefetch("authors", queryset=Author.objects.order_by("full_name").only("full_name"))).
+                order_by("-published_on").
+                first()
+                )
+
+    def get_top_rated(self):
+        return (self.
+                annotate(avg_rating=average_rating()).
+                filter(review_count__gt=0).
+                order_by(average_rating().desc(nulls_last=True), "title").
+                first()
+                )
+
+    def change_review_stats(self, article_id, count_delta, rating_delta):
+        return self.filter(pk=article_id).update(
+            review_count=F("review_count") + count_delta,
+            rating_sum=F("rating_sum") + rating_delta,
+        )
+
+    def add_review_stats(self, reviews):
+        totals = defaultdict(lambda: [0, 0.0])
+        for article_id, rating in reviews:
+            totals[article_id][0] += 1
+            totals[article_id][1] += rating
+
+        if not totals:
+            return 0
+
+        # One UPDATE for the whole batch, joined against the per-article totals passed in as arrays
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} AS a SET review_count = a.review_count + s.total, rating_sum = a.rating_sum + s.rating "
+                f"FROM unnest(%s::bigint[], %s::integer[], %s::double precision[]) AS s(id, total, rating) "
+                f"WHERE a.id = s.id",
+                [list(totals), [total for total, _ in totals.values()], [rating for _, rating in totals.values()]]
+            )
+            return cursor.rowcount
+
+    def rebuild_review_stats(self, queryset=None):
+        queryset = queryset if queryset is not None else self.all()
+        reviews = self.model.article_reviews.field.model.objects.filter(
+            article_id=OuterRef("pk")
+        ).values("article_id")
+
+        return queryset.update(
+            review_count=Coalesce(Subquery(reviews.annotate(total=Count("*")).values("total")), 0),
+            rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum("rating")).values("total")), 0.0),
+        )
+
+    def search(self, query, category=None, limit=None):
+        # search_vector is filled by a database trigger with the same configuration
+        search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+
+        articles = self.filter(search_vector=search_query)
+        if category is not None:
+            articles = articles.filter(category=category)
+
+        articles = (articles.
+                    annotate(rank=SearchRank(models.F("search_vector"), search_query)).
+                    order_by("-rank", "-published_on", "pk").
+                    annotate(headline=SearchHeadline(
+                        "content",
+                        search_query,
+                        config=SEARCH_CONFIG,
+                        start_sel="[",
+                        stop_sel="]",
+                        max_words=25,
+                        min_words=10,
+                    ))
+                    )
+
+        return articles[:limit] if limit is not None else articles
+
+
+class IngestReport:
+    def __init__(self):
+        self.rows = 0
+        self.loaded = 0
+        self.errors = {}
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class ReviewManager(models.Manager):
+    def ingest(self, rows, batch_size=5000):
+        from main_app.models import Article
+        from main_app.validation import BatchValidator
+
+        validator = BatchValidator(self.model)
+        report = IngestReport()
+        start = time.perf_counter()
+        batch = []
+
+        def flush():
+            result = validator.validate(batch)
+            for index, row_errors in result.errors.items():
+                report.errors[report.rows + index] = row_errors
+
+            valid_rows = result.valid_rows
+            with transaction.atomic():
+                self.bulk_create([self.model(**row) for row in valid_rows], batch_size=batch_size)
+                # bulk_create sends no signals, so the article stats are bumped here
+                Article.objects.add_review_stats((row["article_id"], row["rating"]) for row in valid_rows)
+
+            report.rows += len(batch)
+            report.loaded += len(valid_rows)
+
+        for row in rows:
+            batch.append(row)
+
+            if len(batch) == batch_size:
+                flush()
+                batch = []
+
+        if batch:
+            flush()
+
+        report.seconds = time.perf_counter() - start
+
+        return report
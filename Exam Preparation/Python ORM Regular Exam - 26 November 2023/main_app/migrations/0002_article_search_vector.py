@@ -0,0 +1,52 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:52
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Titles weigh more than content, so SearchRank prefers articles that match in the title
+SEARCH_VECTOR_SQL = """
+CREATE FUNCTION main_app_article_search_vector(title text, content text) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+           setweight(to_tsvector('english', coalesce(content, '')), 'B');
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE FUNCTION main_app_article_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := main_app_article_search_vector(NEW.title, NEW.content);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER main_app_article_search_vector
+    BEFORE INSERT OR UPDATE OF title, content ON main_app_article
+    FOR EACH ROW EXECUTE FUNCTION main_app_article_search_vector_update();
+
+UPDATE main_app_article SET search_vector = main_app_article_search_vector(title, content);
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP TRIGGER main_app_article_search_vector ON main_app_article;
+DROP FUNCTION main_app_article_search_vector_update();
+DROP FUNCTION main_app_article_search_vector(text, text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, DROP_SEARCH_VECTOR_SQL),
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='article_search_vector_idx'),
+        ),
+    ]
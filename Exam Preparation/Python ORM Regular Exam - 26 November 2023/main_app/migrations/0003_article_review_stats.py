@@ -0,0 +1,48 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:19
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.db.models import Count, Sum, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_stats(apps, schema_editor):
+    Article = apps.get_model('main_app', 'Article')
+    Review = apps.get_model('main_app', 'Review')
+
+    reviews = Review.objects.filter(article_id=OuterRef('pk')).values('article_id')
+
+    Article.objects.update(
+        review_count=Coalesce(Subquery(reviews.annotate(total=Count('*')).values('total')), 0),
+        rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0.0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_article_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='rating_sum',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(models.OrderBy(models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('rating_sum'), '/', django.db.models.functions.comparison.NullIf(models.F('review_count'), 0)), output_field=models.FloatField()), descending=True, nulls_last=True), models.F('title'), name='article_average_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-published_on'], name='article_published_on_idx'),
+        ),
+    ]
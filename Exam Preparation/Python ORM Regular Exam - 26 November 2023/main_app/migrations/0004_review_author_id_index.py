@@ -0,0 +1,17 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_article_review_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['author', 'id'], name='review_author_id_idx'),
+        ),
+    ]
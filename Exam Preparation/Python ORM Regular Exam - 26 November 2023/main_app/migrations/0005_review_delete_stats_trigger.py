@@ -0,0 +1,40 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:57
+
+from django.db import migrations
+
+# Every delete path, from Review.delete() and cascades to the raw batches of the ban pipeline,
+# takes its reviews off the article stats here, so nothing has to listen to post_delete
+RELEASE_STATS_SQL = """
+CREATE FUNCTION main_app_review_release_stats() RETURNS trigger AS $$
+BEGIN
+    UPDATE main_app_article AS a
+    SET review_count = a.review_count - s.total, rating_sum = a.rating_sum - s.rating
+    FROM (
+        SELECT article_id, count(*) AS total, sum(rating) AS rating FROM deleted_reviews GROUP BY article_id
+    ) AS s
+    WHERE a.id = s.article_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER main_app_review_release_stats
+    AFTER DELETE ON main_app_review
+    REFERENCING OLD TABLE AS deleted_reviews
+    FOR EACH STATEMENT EXECUTE FUNCTION main_app_review_release_stats();
+"""
+
+DROP_RELEASE_STATS_SQL = """
+DROP TRIGGER main_app_review_release_stats ON main_app_review;
+DROP FUNCTION main_app_review_release_stats();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_review_author_id_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(RELEASE_STATS_SQL, DROP_RELEASE_STATS_SQL),
+    ]
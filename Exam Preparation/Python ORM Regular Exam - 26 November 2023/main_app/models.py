@@ -1,7 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinLengthValidator, MinValueValidator, MaxValueValidator
 from django.db import models
 
-from main_app.managers import AuthorManager
+from main_app.managers import AuthorQuerySet, ArticleManager, ReviewManager, average_rating
 from main_app.mixins import BaseModelMixin
 
 
@@ -28,7 +30,7 @@ class Author(models.Model):
 
     website = models.URLField(null=True, blank=True)
 
-    objects = AuthorManager()
+    objects = AuthorQuerySet.as_manager()
 
     def __str__(self):
         return self.full_name
@@ -58,6 +60,37 @@ class Article(BaseModelMixin):
         related_name="authors_articles",
     )
 
+    # Kept current by the main_app_article_search_vector trigger, see migration 0002
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    # Maintained by the Review save signals and the delete trigger of migration 0005,
+    # so the average never needs a scan of the reviews
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    rating_sum = models.FloatField(
+        default=0.0,
+        editable=False,
+    )
+
+    objects = ArticleManager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="article_search_vector_idx"),
+            models.Index(
+                average_rating().desc(nulls_last=True),
+                models.F("title"),
+                name="article_average_rating_idx",
+            ),
+            models.Index(fields=["-published_on"], name="article_published_on_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -82,3 +115,11 @@ class Review(BaseModelMixin):
         on_delete=models.CASCADE,
         related_name="article_reviews",
     )
+
+    objects = ReviewManager()
+
+    class Meta:
+        indexes = [
+            # Lets the ban pipeline walk one author's reviews in primary key order
+            models.Index(fields=["author", "id"], name="review_author_id_idx"),
+        ]
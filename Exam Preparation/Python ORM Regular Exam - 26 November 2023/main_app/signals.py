@@ -0,0 +1,34 @@
+from django.db.models.signals import pre_save, post_save
+from django.dispatch import receiver
+
+from main_app.models import Article, Review
+
+
+@receiver(pre_save, sender=Review)
+def remember_original_rating(sender, instance, **kwargs):
+    instance._old_article_id = None
+    instance._old_rating = None
+
+    if instance.pk:
+        original = Review.objects.filter(
+            pk=instance.pk
+        ).values('article_id', 'rating').first()
+
+        if original:
+            instance._old_article_id = original['article_id']
+            instance._old_rating = original['rating']
+
+
+@receiver(post_save, sender=Review)
+def update_review_stats(sender, instance, **kwargs):
+    old_article_id = getattr(instance, '_old_article_id', None)
+    old_rating = getattr(instance, '_old_rating', None)
+
+    if old_article_id is None:
+        Article.objects.change_review_stats(instance.article_id, 1, instance.rating)
+    elif old_article_id != instance.article_id:
+        Article.objects.change_review_stats(old_article_id, -1, -old_rating)
+        Article.objects.change_review_stats(instance.article_id, 1, instance.rating)
+    elif old_rating != instance.rating:
+        Article.objects.change_review_stats(instance.article_id, 0, instance.rating - old_rating)
+
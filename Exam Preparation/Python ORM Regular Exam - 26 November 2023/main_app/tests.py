@@ -1,3 +1,121 @@
-from django.test import TestCase
+from concurrent.futures import ThreadPoolExecutor
 
-# Create your tests here.
+import pytest
+from django.core.exceptions import ValidationError
+
+import caller
+from main_app import banning
+from main_app.validation import BatchValidator
+from main_app.models import Author, Article, Review
+
+
+@pytest.fixture
+def articles(db):
+    authors = [
+        Author.objects.create(full_name=f'Author {i}', email=f'author{i}@example.com', birth_year=1980 + i)
+        for i in range(3)
+    ]
+
+    for i in range(6):
+        article = Article.objects.create(
+            title=f'Article about databases {i}', content='Indexes make queries fast.',
+            category=Article.CategoryChoices.values[i % 3],
+        )
+        article.authors.add(*authors[:i % 3 + 1])
+
+        for author in authors[i % 2:]:
+            Review.objects.create(content='Good read.', rating=1.0 + i % 5, author=author, article=article)
+
+
+@pytest.mark.parametrize('func, args', [
+    (caller.get_authors, ('Author',)),
+    (caller.get_top_publisher, ()),
+    (caller.get_top_reviewer, ()),
+    (caller.get_latest_article, ()),
+    (caller.get_top_rated_article, ()),
+    (caller.search_articles, ('databases',)),
+])
+def test_caller_query_budget(articles, query_budget, func, args):
+    query_budget(func, *args)
+
+
+def test_ban_author_query_budget(transactional_db, articles, query_budget):
+    # A transactional test, since the savepoints of a wrapping test transaction would be counted too
+    result = query_budget(caller.ban_author, 'author2@example.com')
+
+    assert result == 'Author: Author 2 is banned! 6 reviews deleted.'
+
+
+def assert_review_stats_match(article):
+    article.refresh_from_db()
+    ratings = list(article.article_reviews.values_list('rating', flat=True))
+
+    assert (article.review_count, article.rating_sum) == (len(ratings), sum(ratings))
+
+
+def test_every_delete_path_keeps_the_review_stats(articles):
+    article = Article.objects.get(title='Article about databases 1')
+
+    article.article_reviews.first().delete()
+    assert_review_stats_match(article)
+
+    Author.objects.get(email='author2@example.com').delete()
+    assert_review_stats_match(article)
+
+
+def test_ban_author_takes_the_raw_path_and_keeps_the_review_stats(articles):
+    assert banning.raw_delete_allowed()
+
+    report = banning.ban_author('author1@example.com', batch_size=4)
+
+    assert (report.full_name, report.reviews) == ('Author 1', 6)
+    for article in Article.objects.all():
+        assert_review_stats_match(article)
+
+
+@pytest.mark.parametrize('func, expected', [
+    (caller.get_top_publisher, 'Top Author: Author 0 with 6 published articles.'),
+    (caller.get_top_reviewer, 'Top Reviewer: Author 1 with 6 published reviews.'),
+])
+def test_author_leaderboards_take_one_query(articles, django_assert_num_queries, func, expected):
+    with django_assert_num_queries(1):
+        assert func() == expected
+
+
+def test_author_leaderboards_prefetch_only_when_asked(articles, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        authors = list(Author.objects.get_authors_by_article_count().with_articles())
+        article_counts = [len(author.authors_articles.all()) for author in authors]
+
+    assert article_counts == [author.article_count for author in authors] == [6, 4, 2]
+
+
+def test_batch_validator_reports_the_full_clean_messages(articles):
+    author = Author.objects.first()
+    article = Article.objects.first()
+    rows = [
+        {'author_id': author.pk, 'article_id': article.pk, 'rating': 4.5, 'content': 'A fine article.'},
+        {'author_id': '', 'article_id': article.pk, 'rating': 4.5, 'content': 'A fine article.'},
+        {'author_id': None, 'article_id': 0, 'rating': 'high', 'content': ''},
+        {'author_id': 'x', 'article_id': article.pk, 'rating': 9.0, 'content': 'Too short'},
+    ]
+
+    result = BatchValidator(Review).validate(rows)
+
+    for index, row in enumerate(rows):
+        try:
+            Review(**row).full_clean()
+        except ValidationError as error:
+            expected = error.message_dict
+        else:
+            expected = None
+
+        assert result.errors.get(index) == expected
+
+
+def test_ban_author_in_the_background_uses_the_given_executor(transactional_db, articles):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        report = banning.ban_author('author1@example.com', batch_size=4, background=True, executor=executor).result()
+
+    assert (report.full_name, report.reviews) == ('Author 1', 6)
+    assert Author.objects.get(email='author1@example.com').is_banned
@@ -0,0 +1,139 @@
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator, MinLengthValidator, MaxLengthValidator
+
+# The common limit validators are checked with one comprehension per column instead of a call per value
+LIMIT_CHECKS = {
+    MinValueValidator: lambda column, limit: [i for i, value in enumerate(column) if value is not None and value < limit],
+    MaxValueValidator: lambda column, limit: [i for i, value in enumerate(column) if value is not None and value > limit],
+    MinLengthValidator: lambda column, limit: [i for i, value in enumerate(column) if value is not None and len(value) < limit],
+    MaxLengthValidator: lambda column, limit: [i for i, value in enumerate(column) if value is not None and len(value) > limit],
+}
+
+
+class BatchResult:
+    def __init__(self, rows, errors):
+        self.rows = rows
+        self.errors = errors
+
+    @property
+    def valid_rows(self):
+        return [row for index, row in enumerate(self.rows) if index not in self.errors]
+
+
+class BatchValidator:
+    def __init__(self, model, exclude=()):
+        self.model = model
+        self.fields = [
+            field for field in model._meta.concrete_fields
+            if field.editable and not field.primary_key and field.name not in exclude
+        ]
+
+    def validate(self, rows):
+        errors = {}
+        cleaned_rows = [dict(row) for row in rows]
+
+        def add_error(index, field, message):
+            errors.setdefault(index, {}).setdefault(field.name, []).append(message)
+
+        for field in self.fields:
+            column = self.clean_column(field, cleaned_rows, add_error)
+
+            for validator in field.validators:
+                check = LIMIT_CHECKS.get(type(validator))
+                if check is None:
+                    self.run_validator(field, validator, column, add_error)
+                    continue
+
+                limit = validator.limit_value() if callable(validator.limit_value) else validator.limit_value
+                for index in check(column, limit):
+                    value = column[index]
+                    show_value = value if isinstance(validator, (MinValueValidator, MaxValueValidator)) else len(value)
+                    add_error(index, field, validator.message % {
+                        'limit_value': limit, 'show_value': show_value, 'value': value,
+                    })
+
+            if field.is_relation:
+                self.check_related(field, column, add_error)
+
+            if field.unique:
+                self.check_unique(field, column, add_error)
+
+        return BatchResult(cleaned_rows, errors)
+
+    def clean_column(self, field, rows, add_error):
+        # Mirrors Field.clean(): conversion, null/blank and choices, leaving the validators to the column checks
+        choices = {str(value) for value, _ in field.flatchoices} if field.choices else None
+        column = []
+
+        for index, row in enumerate(rows):
+            # A missing column falls back to the field default, as it would for Model(**row)
+            value = row[field.attname] if field.attname in row else field.get_default()
+
+            # Empty values of blank fields are skipped, as in Model.clean_fields()
+            if field.blank and value in field.empty_values:
+                column.append(None)
+                continue
+
+            # Converted before the null/blank checks, so an empty foreign key reports the same error as full_clean()
+            try:
+                value = field.to_python(value)
+            except ValidationError as error:
+                for message in error.messages:
+                    add_error(index, field, message)
+                column.append(None)
+                continue
+
+            if value in field.empty_values:
+                if value is None and not field.null:
+                    add_error(index, field, field.error_messages['null'])
+                else:
+                    add_error(index, field, field.error_messages['blank'])
+                column.append(None)
+                continue
+
+            if choices is not None and str(value) not in choices:
+                add_error(index, field, field.error_messages['invalid_choice'] % {'value': value})
+
+            row[field.attname] = value
+            column.append(value)
+
+        return column
+
+    def run_validator(self, field, validator, column, add_error):
+        for index, value in enumerate(column):
+            if value is None:
+                continue
+
+            try:
+                validator(value)
+            except ValidationError as error:
+                for message in error.messages:
+                    add_error(index, field, message)
+
+    def check_related(self, field, column, add_error):
+        # One query per batch instead of the one per row that full_clean() does for every foreign key
+        ids = {value for value in column if value is not None}
+        existing = set(field.related_model._base_manager.filter(pk__in=ids).values_list('pk', flat=True))
+
+        for index, value in enumerate(column):
+            if value is not None and value not in existing:
+                add_error(index, field, field.error_messages['invalid'] % {
+                    'model': field.related_model._meta.verbose_name,
+                    'pk': value,
+                    'field': field.remote_field.field_name,
+                    'value': value,
+                })
+
+    def check_unique(self, field, column, add_error):
+        values = [value for value in column if value is not None]
+        taken = set(self.model._base_manager.filter(**{f'{field.attname}__in': values}).values_list(field.attname, flat=True))
+        message = self.model().unique_error_message(self.model, (field.name,)).messages[0]
+
+        # Later duplicates within the batch are rejected too, since only one of them could be inserted
+        for index, value in enumerate(column):
+            if value is None:
+                continue
+
+            if value in taken:
+                add_error(index, field, message)
+            taken.add(value)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import Spacecraft, SpacecraftUtilization
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the SpacecraftUtilization read model from the missions table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        spacecraft_ids = Spacecraft.objects.order_by('pk').values_list('pk', flat=True)
+
+        batch = []
+        total = 0
+        for pk in spacecraft_ids.iterator(chunk_size=batch_size):
+            batch.append(pk)
+
+            if len(batch) == batch_size:
+                total += len(SpacecraftUtilization.objects.refresh(batch, batch_size))
+                batch = []
+
+        if batch:
+            total += len(SpacecraftUtilization.objects.refresh(batch, batch_size))
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt utilization for {total} spacecrafts.'))
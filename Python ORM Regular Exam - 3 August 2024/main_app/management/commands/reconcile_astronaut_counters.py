@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import Astronaut
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the missions_count and commanded_count counters of all astronauts.'
+
+    def handle(self, *args, **options):
+        updated = Astronaut.objects.reconcile_counters()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled counters for {updated} astronauts.'))
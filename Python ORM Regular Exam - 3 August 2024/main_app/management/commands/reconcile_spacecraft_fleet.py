@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from main_app.models import SpacecraftFleet
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the spacecraft count and total weight of the fleet.'
+
+    def handle(self, *args, **options):
+        fleet = SpacecraftFleet.objects.reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f'Reconciled the fleet totals: {fleet.spacecraft_count} spacecrafts, {fleet.total_weight:.1f}kg.'
+        ))
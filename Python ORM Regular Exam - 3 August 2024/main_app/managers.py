@@ -1,10 +1,253 @@
-from django.db import models
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, models, transaction
+from django.db.models.functions import Coalesce, Greatest
+
+from increments import IncrementQuerySetMixin
+
 
 class AstronautManager(models.Manager):
+    def search(self, search_string, limit=None, ranked=True):
+        # icontains compiles to UPPER(col) LIKE UPPER(...), which the trigram indexes on UPPER(col) cover
+        astronauts = self.filter(
+            models.Q(name__icontains=search_string) | models.Q(phone_number__icontains=search_string)
+        )
+
+        # Callers that order the matches themselves skip the similarity, it is computed for every match
+        if ranked:
+            astronauts = astronauts.annotate(
+                similarity=Greatest(
+                    TrigramSimilarity('name', search_string),
+                    TrigramSimilarity('phone_number', search_string)
+                )
+            ).order_by(
+                '-similarity',
+                'name'
+            )
+
+        return astronauts[:limit] if limit is not None else astronauts
+
     def get_astronauts_by_missions_count(self):
-        return self.annotate(
-            missions_count=models.Count('astronauts_missions')
-        ).order_by(
+        return self.order_by(
             '-missions_count',
             'phone_number'
         )
+
+    def get_astronauts_by_commanded_count(self):
+        return self.filter(
+            commanded_count__gt=0
+        ).order_by(
+            '-commanded_count',
+            'phone_number'
+        )
+
+    def change_missions_count(self, astronaut_ids, delta):
+        return self.filter(pk__in=astronaut_ids).update(
+            missions_count=models.F('missions_count') + delta
+        )
+
+    def change_commanded_count(self, astronaut_id, delta):
+        return self.filter(pk=astronaut_id).update(
+            commanded_count=models.F('commanded_count') + delta
+        )
+
+    def reconcile_counters(self):
+        from main_app.models import Mission
+
+        missions = Mission.astronauts.through.objects.filter(
+            astronaut_id=models.OuterRef('pk')
+        ).values('astronaut_id').annotate(
+            total=models.Count('*')
+        ).values('total')
+
+        commanded = Mission.objects.filter(
+            commander_id=models.OuterRef('pk')
+        ).values('commander_id').annotate(
+            total=models.Count('*')
+        ).values('total')
+
+        return self.update(
+            missions_count=Coalesce(models.Subquery(missions), 0),
+            commanded_count=Coalesce(models.Subquery(commanded), 0),
+        )
+
+
+class SpacecraftQuerySet(IncrementQuerySetMixin, models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        from main_app.models import SpacecraftFleet
+
+        # bulk_create does not send post_save, so the fleet totals are rebuilt in the same transaction
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            SpacecraftFleet.objects.reconcile()
+
+        return created
+
+    def update(self, **kwargs):
+        from main_app.models import SpacecraftFleet
+
+        # Neither update() nor bulk_update() send post_save either
+        with transaction.atomic(using=self.db):
+            rows = super().update(**kwargs)
+
+            if rows and 'weight' in kwargs:
+                SpacecraftFleet.objects.reconcile()
+
+        return rows
+
+    def decrease_weight(self, amount, batch_size=1000, lock_timeout='1s'):
+        pks = self.order_by('pk').values_list('pk', flat=True).distinct()
+
+        from main_app.models import SpacecraftFleet
+
+        updated_count = 0
+        fleet = None
+        last_pk = None
+
+        while True:
+            batch = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+            batch = list(batch[:batch_size])
+
+            if not batch:
+                break
+
+            last_pk = batch[-1]
+
+            # Each batch is its own short transaction, so row locks are only held for batch_size rows
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute("SELECT set_config('lock_timeout', %s, true)", [lock_timeout])
+
+                # Unclamped, so a spacecraft is only decreased when the full amount keeps it at or above 0
+                updated = self.model.objects.filter(pk__in=batch).increment('weight', -amount, clamp=False)
+
+                # The fleet totals move in the same transaction, so they always match the committed weights
+                if updated:
+                    updated_count += len(updated)
+                    fleet = SpacecraftFleet.objects.change_totals(weight_delta=-amount * len(updated))
+
+            if len(batch) < batch_size:
+                break
+
+        return updated_count, updated_count * amount, fleet
+
+
+class SpacecraftFleetManager(models.Manager):
+    def change_totals(self, count_delta=0, weight_delta=0.0):
+        quote = connection.ops.quote_name
+        meta = self.model._meta
+        count = quote(meta.get_field('spacecraft_count').column)
+        weight = quote(meta.get_field('total_weight').column)
+
+        # The UPDATE waits for the row lock, so the returned totals include every committed change
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {quote(meta.db_table)} '
+                f'SET {count} = {count} + %s, {weight} = {weight} + %s '
+                f'RETURNING {quote(meta.pk.column)}, {count}, {weight}',
+                [count_delta, weight_delta]
+            )
+            row = cursor.fetchone()
+
+        # The row is gone after a flush or truncate. The delta is already applied to the spacecraft
+        # table by now, so rebuilding the totals from it includes the change as well
+        if row is None:
+            return self.reconcile()
+
+        return self.model(pk=row[0], spacecraft_count=row[1], total_weight=row[2])
+
+    def reconcile(self):
+        from main_app.models import Spacecraft
+
+        totals = Spacecraft.objects.aggregate(
+            spacecraft_count=models.Count('pk'),
+            total_weight=Coalesce(models.Sum('weight'), 0.0),
+        )
+
+        # An upsert, so two callers that both find the row missing do not race on its insert
+        fleet, = self.bulk_create(
+            [self.model(pk=1, **totals)],
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=['spacecraft_count', 'total_weight'],
+        )
+
+        return fleet
+
+
+class MissionQuerySet(models.QuerySet):
+    def with_report(self):
+        crew = self.model.astronauts.through.objects.filter(
+            mission_id=models.OuterRef('pk')
+        ).values('mission_id')
+
+        return self.select_related(
+            'commander',
+            'spacecraft'
+        ).annotate(
+            astronaut_names=Coalesce(
+                models.Subquery(crew.annotate(
+                    names=StringAgg('astronaut__name', ', ', ordering='astronaut__name')
+                ).values('names')),
+                models.Value(''),
+                output_field=models.TextField()
+            ),
+            total_spacewalks=models.Subquery(crew.annotate(
+                total=models.Sum('astronaut__spacewalks')
+            ).values('total')),
+        )
+
+    def last_completed(self):
+        return self.filter(
+            status=self.model.StatusChoices.COMPLETED
+        ).order_by(
+            '-launch_date'
+        ).with_report().first()
+
+
+class SpacecraftUtilizationManager(models.Manager):
+    def most_used(self):
+        return self.select_related(
+            'spacecraft'
+        ).filter(
+            missions_count__gt=0
+        ).order_by(
+            '-missions_count',
+            'spacecraft__name'
+        ).first()
+
+    def refresh(self, spacecraft_ids=None, batch_size=1000):
+        from main_app.models import Spacecraft, Mission
+
+        spacecrafts = Spacecraft.objects.all()
+        if spacecraft_ids is not None:
+            spacecrafts = spacecrafts.filter(pk__in=spacecraft_ids)
+
+        missions = Mission.objects.filter(
+            spacecraft_id=models.OuterRef('pk')
+        ).values('spacecraft_id').annotate(
+            total=models.Count('*')
+        ).values('total')
+
+        astronauts = Mission.astronauts.through.objects.filter(
+            mission__spacecraft_id=models.OuterRef('pk')
+        ).values('mission__spacecraft_id').annotate(
+            total=models.Count('astronaut_id', distinct=True)
+        ).values('total')
+
+        rows = spacecrafts.annotate(
+            total_missions=Coalesce(models.Subquery(missions), 0),
+            total_astronauts=Coalesce(models.Subquery(astronauts), 0),
+        ).values_list('pk', 'total_missions', 'total_astronauts')
+
+        utilizations = [
+            self.model(spacecraft_id=pk, missions_count=missions_count, astronauts_count=astronauts_count)
+            for pk, missions_count, astronauts_count in rows.iterator(chunk_size=batch_size)
+        ]
+
+        return self.bulk_create(
+            utilizations,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['spacecraft'],
+            update_fields=['missions_count', 'astronauts_count'],
+        )
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:13
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    Astronaut = apps.get_model('main_app', 'Astronaut')
+    Mission = apps.get_model('main_app', 'Mission')
+
+    missions = Mission.astronauts.through.objects.filter(
+        astronaut_id=models.OuterRef('pk')
+    ).values('astronaut_id').annotate(total=models.Count('*')).values('total')
+
+    commanded = Mission.objects.filter(
+        commander_id=models.OuterRef('pk')
+    ).values('commander_id').annotate(total=models.Count('*')).values('total')
+
+    Astronaut.objects.update(
+        missions_count=Coalesce(models.Subquery(missions), 0),
+        commanded_count=Coalesce(models.Subquery(commanded), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='astronaut',
+            name='commanded_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='astronaut',
+            name='missions_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='astronaut',
+            index=models.Index(fields=['-missions_count', 'phone_number'], name='astronaut_missions_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='astronaut',
+            index=models.Index(fields=['-commanded_count', 'phone_number'], name='astronaut_commanded_count_idx'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_utilization(apps, schema_editor):
+    Spacecraft = apps.get_model('main_app', 'Spacecraft')
+    Mission = apps.get_model('main_app', 'Mission')
+    SpacecraftUtilization = apps.get_model('main_app', 'SpacecraftUtilization')
+
+    missions = Mission.objects.filter(
+        spacecraft_id=models.OuterRef('pk')
+    ).values('spacecraft_id').annotate(total=models.Count('*')).values('total')
+
+    astronauts = Mission.astronauts.through.objects.filter(
+        mission__spacecraft_id=models.OuterRef('pk')
+    ).values('mission__spacecraft_id').annotate(total=models.Count('astronaut_id', distinct=True)).values('total')
+
+    rows = Spacecraft.objects.annotate(
+        total_missions=Coalesce(models.Subquery(missions), 0),
+        total_astronauts=Coalesce(models.Subquery(astronauts), 0),
+    ).values_list('pk', 'total_missions', 'total_astronauts')
+
+    SpacecraftUtilization.objects.bulk_create(
+        [
+            SpacecraftUtilization(spacecraft_id=pk, missions_count=missions_count, astronauts_count=astronauts_count)
+            for pk, missions_count, astronauts_count in rows.iterator(chunk_size=1000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_astronaut_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpacecraftUtilization',
+            fields=[
+                ('spacecraft', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='utilization', serialize=False, to='main_app.spacecraft')),
+                ('missions_count', models.PositiveIntegerField(default=0)),
+                ('astronauts_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-missions_count'], name='spacecraft_util_missions_idx')],
+            },
+        ),
+        migrations.RunPython(fill_utilization, migrations.RunPython.noop),
+    ]
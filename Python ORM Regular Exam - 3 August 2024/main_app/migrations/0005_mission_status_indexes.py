@@ -0,0 +1,21 @@
+# Generated by Django 5.0.4 on 2026-10-18 07:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_spacecraft_utilization'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(fields=['status', '-launch_date'], name='mission_status_launch_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mission',
+            index=models.Index(condition=models.Q(('status', 'Planned')), fields=['spacecraft'], name='mission_planned_spacecraft_idx'),
+        ),
+    ]
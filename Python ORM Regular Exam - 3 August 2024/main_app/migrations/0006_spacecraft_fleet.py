@@ -0,0 +1,35 @@
+# Generated by Django 5.0.4 on 2026-10-18 08:51
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_fleet(apps, schema_editor):
+    Spacecraft = apps.get_model('main_app', 'Spacecraft')
+    SpacecraftFleet = apps.get_model('main_app', 'SpacecraftFleet')
+
+    totals = Spacecraft.objects.aggregate(
+        spacecraft_count=models.Count('pk'),
+        total_weight=Coalesce(models.Sum('weight'), 0.0),
+    )
+
+    SpacecraftFleet.objects.create(pk=1, **totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_mission_status_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpacecraftFleet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('spacecraft_count', models.PositiveIntegerField(default=0)),
+                ('total_weight', models.FloatField(default=0.0)),
+            ],
+        ),
+        migrations.RunPython(fill_fleet, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,15 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import MinLengthValidator, MinValueValidator, RegexValidator
 from django.db import models
+from django.db.models.functions import Upper
 
-from main_app.managers import AstronautManager
+from main_app.managers import (
+    AstronautManager,
+    MissionQuerySet,
+    SpacecraftFleetManager,
+    SpacecraftQuerySet,
+    SpacecraftUtilizationManager,
+)
 
 
 # Create your models here.
@@ -54,8 +62,38 @@ class Astronaut(Base):
         ]
     )
 
+    missions_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    commanded_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
     objects = AstronautManager()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-missions_count', 'phone_number'],
+                name='astronaut_missions_count_idx'
+            ),
+            models.Index(
+                fields=['-commanded_count', 'phone_number'],
+                name='astronaut_commanded_count_idx'
+            ),
+            GinIndex(
+                OpClass(Upper('name'), name='gin_trgm_ops'),
+                name='astronaut_name_trgm_idx'
+            ),
+            GinIndex(
+                OpClass(Upper('phone_number'), name='gin_trgm_ops'),
+                name='astronaut_phone_trgm_idx'
+            ),
+        ]
+
 
 class Spacecraft(Base, LaunchedMixin):
     manufacturer = models.CharField(
@@ -74,6 +112,8 @@ class Spacecraft(Base, LaunchedMixin):
         ]
     )
 
+    objects = SpacecraftQuerySet.as_manager()
+
 
 class Mission(Base, LaunchedMixin):
     class StatusChoices(models.TextChoices):
@@ -110,3 +150,62 @@ class Mission(Base, LaunchedMixin):
         blank=True,
         related_name='commanded_missions'
     )
+
+    objects = MissionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['status', '-launch_date'],
+                name='mission_status_launch_idx'
+            ),
+            models.Index(
+                fields=['spacecraft'],
+                condition=models.Q(status='Planned'),
+                name='mission_planned_spacecraft_idx'
+            ),
+        ]
+
+
+class SpacecraftUtilization(models.Model):
+    spacecraft = models.OneToOneField(
+        Spacecraft,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='utilization'
+    )
+
+    missions_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    astronauts_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    objects = SpacecraftUtilizationManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['-missions_count'],
+                name='spacecraft_util_missions_idx'
+            ),
+        ]
+
+
+class SpacecraftFleet(models.Model):
+    # A single row with the fleet totals, so the average weight is known without scanning every spacecraft
+    spacecraft_count = models.PositiveIntegerField(
+        default=0
+    )
+
+    total_weight = models.FloatField(
+        default=0.0
+    )
+
+    objects = SpacecraftFleetManager()
+
+    @property
+    def average_weight(self):
+        return self.total_weight / self.spacecraft_count if self.spacecraft_count else 0.0
@@ -0,0 +1,159 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from main_app.models import Astronaut, Mission, Spacecraft, SpacecraftFleet, SpacecraftUtilization
+
+
+def refresh_utilization(spacecraft_ids):
+    spacecraft_ids = {pk for pk in spacecraft_ids if pk}
+
+    # Deferred to commit so a cascading Spacecraft delete does not resurrect its utilization row
+    if spacecraft_ids:
+        transaction.on_commit(lambda: SpacecraftUtilization.objects.refresh(spacecraft_ids))
+
+
+def linked_pk_set(through, instance, reverse, pk_set):
+    if reverse:
+        links = through.objects.filter(astronaut_id=instance.pk, mission_id__in=pk_set)
+        return set(links.values_list('mission_id', flat=True))
+
+    links = through.objects.filter(mission_id=instance.pk, astronaut_id__in=pk_set)
+    return set(links.values_list('astronaut_id', flat=True))
+
+
+@receiver(m2m_changed, sender=Mission.astronauts.through)
+def update_missions_count(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # pk_set is not provided on clear, so collect the related ids before they are gone
+        if reverse:
+            pk_set = set(instance.astronauts_missions.values_list('pk', flat=True))
+            instance._cleared_mission_ids = pk_set
+        else:
+            pk_set = set(instance.astronauts.values_list('pk', flat=True))
+        delta = -1
+    elif action == 'pre_remove':
+        # pk_set holds the ids the caller asked to remove, only the linked ones lose a mission
+        instance._removed_pk_set = linked_pk_set(sender, instance, reverse, pk_set)
+        return
+    elif action == 'post_add':
+        delta = 1
+    elif action == 'post_remove':
+        pk_set = getattr(instance, '_removed_pk_set', set())
+        delta = -1
+    else:
+        return
+
+    if not pk_set:
+        return
+
+    if reverse:
+        Astronaut.objects.change_missions_count([instance.pk], delta * len(pk_set))
+    else:
+        Astronaut.objects.change_missions_count(pk_set, delta)
+
+
+@receiver(m2m_changed, sender=Mission.astronauts.through)
+def update_crew_utilization(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        refresh_utilization([instance.spacecraft_id])
+        return
+
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_mission_ids', set())
+
+    refresh_utilization(
+        Mission.objects.filter(pk__in=pk_set).values_list('spacecraft_id', flat=True)
+    )
+
+
+@receiver(pre_save, sender=Mission)
+def remember_original_state(sender, instance, **kwargs):
+    instance._old_commander_id = None
+    instance._old_spacecraft_id = None
+
+    if instance.pk:
+        original = Mission.objects.filter(
+            pk=instance.pk
+        ).values('commander_id', 'spacecraft_id').first()
+
+        if original:
+            instance._old_commander_id = original['commander_id']
+            instance._old_spacecraft_id = original['spacecraft_id']
+
+
+@receiver(post_save, sender=Mission)
+def update_commanded_count(sender, instance, **kwargs):
+    old_commander_id = getattr(instance, '_old_commander_id', None)
+
+    if old_commander_id == instance.commander_id:
+        return
+
+    if old_commander_id:
+        Astronaut.objects.change_commanded_count(old_commander_id, -1)
+
+    if instance.commander_id:
+        Astronaut.objects.change_commanded_count(instance.commander_id, 1)
+
+
+@receiver(post_save, sender=Mission)
+def update_spacecraft_utilization(sender, instance, created, **kwargs):
+    old_spacecraft_id = getattr(instance, '_old_spacecraft_id', None)
+
+    if created or old_spacecraft_id != instance.spacecraft_id:
+        refresh_utilization([old_spacecraft_id, instance.spacecraft_id])
+
+
+@receiver(pre_delete, sender=Mission)
+def release_mission_astronauts(sender, instance, **kwargs):
+    # The m2m rows are removed by the delete cascade without firing m2m_changed
+    astronaut_ids = list(instance.astronauts.values_list('pk', flat=True))
+
+    if astronaut_ids:
+        Astronaut.objects.change_missions_count(astronaut_ids, -1)
+
+
+@receiver(post_delete, sender=Mission)
+def release_mission_commander(sender, instance, **kwargs):
+    if instance.commander_id:
+        Astronaut.objects.change_commanded_count(instance.commander_id, -1)
+
+    refresh_utilization([instance.spacecraft_id])
+
+
+@receiver(pre_delete, sender=Astronaut)
+def release_astronaut_utilization(sender, instance, **kwargs):
+    # Deleting an astronaut cascades their m2m rows without firing m2m_changed either
+    refresh_utilization(
+        instance.astronauts_missions.values_list('spacecraft_id', flat=True)
+    )
+
+
+@receiver(pre_save, sender=Spacecraft)
+def remember_original_weight(sender, instance, **kwargs):
+    instance._old_weight = None
+
+    if instance.pk:
+        instance._old_weight = Spacecraft.objects.filter(
+            pk=instance.pk
+        ).values_list('weight', flat=True).first()
+
+
+@receiver(post_save, sender=Spacecraft)
+def update_fleet_totals(sender, instance, created, **kwargs):
+    if created:
+        SpacecraftFleet.objects.change_totals(1, float(instance.weight))
+        return
+
+    old_weight = getattr(instance, '_old_weight', None)
+
+    if old_weight is not None and old_weight != float(instance.weight):
+        SpacecraftFleet.objects.change_totals(0, float(instance.weight) - old_weight)
+
+
+@receiver(post_delete, sender=Spacecraft)
+def release_fleet_totals(sender, instance, **kwargs):
+    SpacecraftFleet.objects.change_totals(-1, -float(instance.weight))
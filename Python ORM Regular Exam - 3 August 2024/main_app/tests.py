@@ -1,3 +1,208 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.db.models import Avg, Count, Sum
 from django.test import TestCase
 
-# Create your tests here.
+import caller
+
+from main_app.models import Astronaut, Mission, Spacecraft, SpacecraftFleet, SpacecraftUtilization
+
+
+class MissionsCountTests(TestCase):
+    def setUp(self):
+        spacecraft = Spacecraft.objects.create(
+            name='Ship', manufacturer='Maker', capacity=3, weight=1000.0, launch_date=date(2024, 1, 1)
+        )
+        self.mission = Mission.objects.create(name='Mission', spacecraft=spacecraft, launch_date=date(2024, 2, 1))
+        other_mission = Mission.objects.create(name='Other', spacecraft=spacecraft, launch_date=date(2024, 3, 1))
+
+        self.member = Astronaut.objects.create(name='Member', phone_number='1')
+        self.outsider = Astronaut.objects.create(name='Outsider', phone_number='2')
+        self.mission.astronauts.add(self.member)
+        other_mission.astronauts.add(self.outsider)
+
+    def assertMissionsCount(self, astronaut, expected):
+        astronaut.refresh_from_db()
+        self.assertEqual(astronaut.missions_count, expected)
+
+    def test_remove_decrements_members(self):
+        self.mission.astronauts.remove(self.member)
+
+        self.assertMissionsCount(self.member, 0)
+
+    def test_remove_of_a_non_member_keeps_the_count(self):
+        self.mission.astronauts.remove(self.outsider)
+        self.mission.astronauts.remove(self.outsider, self.member)
+
+        self.assertMissionsCount(self.outsider, 1)
+        self.assertMissionsCount(self.member, 0)
+
+    def test_reverse_remove_of_a_non_member_keeps_the_count(self):
+        self.outsider.astronauts_missions.remove(self.mission)
+        self.outsider.astronauts_missions.remove(self.mission)
+
+        self.assertMissionsCount(self.outsider, 1)
+
+
+class SpacecraftUtilizationTests(TestCase):
+    def setUp(self):
+        self.spacecraft = Spacecraft.objects.create(
+            name='Ship 0', manufacturer='Maker', capacity=3, weight=1000.0, launch_date=date(2024, 1, 1)
+        )
+        self.crew = [Astronaut.objects.create(name=f'Crew {i}', phone_number=str(i)) for i in range(3)]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            mission = Mission.objects.create(name='Mission', spacecraft=self.spacecraft, launch_date=date(2024, 2, 1))
+            mission.astronauts.add(*self.crew)
+
+    def assertAstronautsCount(self, expected):
+        utilization = SpacecraftUtilization.objects.get(spacecraft=self.spacecraft)
+        self.assertEqual(utilization.astronauts_count, expected)
+
+    def test_add_counts_the_crew(self):
+        self.assertAstronautsCount(3)
+
+    def test_astronaut_delete_refreshes_the_crew_count(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.crew[0].delete()
+
+        self.assertAstronautsCount(2)
+
+
+class SpacecraftFleetTests(TestCase):
+    def setUp(self):
+        self.spacecrafts = [
+            Spacecraft.objects.create(
+                name=f'Ship {i}', manufacturer='Maker', capacity=3, weight=weight, launch_date=date(2024, 1, 1)
+            )
+            for i, weight in enumerate((150.0, 400.0, 1000.0))
+        ]
+
+        for spacecraft in self.spacecrafts[:2]:
+            Mission.objects.create(name='Planned', spacecraft=spacecraft, launch_date=date(2024, 2, 1))
+
+    def assertFleetMatches(self):
+        fleet = SpacecraftFleet.objects.get()
+        totals = Spacecraft.objects.aggregate(count=Count('pk'), weight=Sum('weight'))
+
+        self.assertEqual(fleet.spacecraft_count, totals['count'])
+        self.assertAlmostEqual(fleet.total_weight, totals['weight'])
+
+    def test_save_and_delete_keep_the_totals(self):
+        self.spacecrafts[0].weight = 250.0
+        self.spacecrafts[0].save()
+        self.spacecrafts[2].delete()
+
+        self.assertFleetMatches()
+
+    def test_bulk_writes_keep_the_totals(self):
+        Spacecraft.objects.bulk_create([
+            Spacecraft(name='Bulk', manufacturer='Maker', capacity=3, weight=700.0, launch_date=date(2024, 1, 1))
+        ])
+        Spacecraft.objects.filter(pk=self.spacecrafts[1].pk).update(weight=300.0)
+
+        self.assertFleetMatches()
+
+    def test_missing_row_is_rebuilt(self):
+        SpacecraftFleet.objects.all().delete()
+        self.spacecrafts[2].delete()
+
+        self.assertFleetMatches()
+
+    def test_decrease_reports_the_new_average(self):
+        result = caller.decrease_spacecrafts_weight()
+        average_weight = Spacecraft.objects.aggregate(avg=Avg('weight'))['avg']
+
+        self.assertEqual(result, (
+            f"The weight of 1 spacecrafts has been decreased. "
+            f"The new average weight of all spacecrafts is {average_weight:.1f}kg"
+        ))
+        self.assertFleetMatches()
+
+
+class MissionIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        spacecrafts = Spacecraft.objects.bulk_create(
+            Spacecraft(
+                name=f'Ship {i}', manufacturer='Maker', capacity=3, weight=100.0 + i * 10, launch_date=date(2024, 1, 1)
+            )
+            for i in range(500)
+        )
+
+        # Few missions are planned, the rest are split between ongoing and completed
+        statuses = [Mission.StatusChoices.ONGOING, Mission.StatusChoices.COMPLETED]
+        Mission.objects.bulk_create(
+            Mission(
+                name=f'Mission {i}',
+                status=Mission.StatusChoices.PLANNED if i % 20 == 0 else statuses[i % 2],
+                spacecraft=spacecrafts[i % len(spacecrafts)],
+                launch_date=date(2000, 1, 1) + timedelta(days=i),
+            )
+            for i in range(20000)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, queryset, index_name):
+        self.assertIn(index_name, queryset.explain())
+
+    def test_last_completed_mission_uses_the_status_launch_index(self):
+        missions = Mission.objects.filter(
+            status=Mission.StatusChoices.COMPLETED
+        ).order_by('-launch_date').with_report()[:1]
+
+        self.assertUsesIndex(missions, 'mission_status_launch_idx')
+
+    def test_admin_status_filter_uses_the_status_launch_index(self):
+        missions = Mission.objects.filter(
+            status=Mission.StatusChoices.ONGOING
+        ).order_by('-launch_date')[:100]
+
+        self.assertUsesIndex(missions, 'mission_status_launch_idx')
+
+    def test_decrease_weight_uses_the_planned_spacecraft_index(self):
+        # The keyset query decrease_weight() runs for its first batch
+        spacecrafts = Spacecraft.objects.filter(
+            spacecraft_missions__status=Mission.StatusChoices.PLANNED,
+            weight__gte=200.0
+        ).order_by('pk').values_list('pk', flat=True).distinct()[:1000]
+
+        self.assertUsesIndex(spacecrafts, 'mission_planned_spacecraft_idx')
+
+
+@pytest.fixture
+def missions(django_capture_on_commit_callbacks):
+    spacecraft = Spacecraft.objects.create(
+        name='Ship', manufacturer='Maker', capacity=3, weight=1000.0, launch_date=date(2024, 1, 1)
+    )
+    crew = [Astronaut.objects.create(name=f'Crew {i}', phone_number=f'12{i}') for i in range(3)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for i, status in enumerate(Mission.StatusChoices.values):
+            mission = Mission.objects.create(
+                name=f'Mission {i}', status=status, spacecraft=spacecraft, commander=crew[i],
+                launch_date=date(2024, 2, 1) + timedelta(days=i),
+            )
+            mission.astronauts.add(*crew)
+
+
+@pytest.mark.parametrize('func, args', [
+    (caller.get_astronauts, ('12',)),
+    (caller.get_top_astronaut, ()),
+    (caller.get_top_commander, ()),
+    (caller.get_last_completed_mission, ()),
+    (caller.get_most_used_spacecraft, ()),
+])
+def test_caller_query_budget(db, missions, query_budget, func, args):
+    query_budget(func, *args)
+
+
+def test_decrease_spacecrafts_weight_query_budget(transactional_db, missions, query_budget):
+    # A transactional test, since the savepoints of a wrapping test transaction would be counted too
+    result = query_budget(caller.decrease_spacecrafts_weight)
+
+    assert result.startswith('The weight of 1 spacecrafts has been decreased.')
@@ -9,6 +9,7 @@ django.setup()
 
 # Import your models
 from main_app.models import ArtworkGallery, Laptop, OSChoices, ChessPlayer, Meal, Dungeon, Workout
+from reports import write_lines
 
 
 # Create and check models
@@ -131,13 +132,14 @@ def delete_lunch_and_snack_meals():
     Meal.objects.filter(meal_type__in=('Lunch', 'Snack')).delete()
 
 
-def show_hard_dungeons():
+def iter_hard_dungeons(chunk_size=2000):
     dungeons = Dungeon.objects.filter(difficulty='Hard').order_by('-location')
-    result = []
-    for d in dungeons:
-        result.append(f"{d.name} is guarded by {d.boss_name} who has {d.boss_health} health points!")
+    for d in dungeons.iterator(chunk_size=chunk_size):
+        yield f"{d.name} is guarded by {d.boss_name} who has {d.boss_health} health points!"
 
-    return '\n'.join(result)
+
+def show_hard_dungeons():
+    return '\n'.join(iter_hard_dungeons())
 
 
 def bulk_create_dungeons(args):
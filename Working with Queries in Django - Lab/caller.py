@@ -7,6 +7,8 @@ django.setup()
 
 # Import your models
 from main_app.models import Author, Book, Review
+from reports import write_lines
+
 
 # Create and check models
 def add_records_to_database():
@@ -71,13 +73,14 @@ def find_authors_nationalities():
     return '\n'.join(result)
 
 
-def order_books_by_year():
+def iter_books_by_year(chunk_size=2000):
     books = Book.objects.all().order_by('publication_year', 'title')
-    result = []
-    for book in books:
-        result.append(f"{book.publication_year} year: {str(book)}")
+    for book in books.iterator(chunk_size=chunk_size):
+        yield f"{book.publication_year} year: {str(book)}"
 
-    return '\n'.join(result)
+
+def order_books_by_year():
+    return '\n'.join(iter_books_by_year())
 
 
 def delete_review_by_id(given_id):
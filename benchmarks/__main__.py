@@ -0,0 +1,81 @@
+import argparse
+import importlib
+import json
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.datasets import DATASETS
+from benchmarks.project import REPO_ROOT, setup_project
+
+
+def run(args):
+    dataset = importlib.import_module(f'benchmarks.datasets.{args.dataset}')
+    output = Path(args.output or REPO_ROOT / 'bench_results' / f'{args.dataset}-{args.scale}.json').resolve()
+    setup_project(dataset.PROJECT)
+
+    results = {
+        'dataset': args.dataset,
+        'scale': args.scale,
+        'seed': args.seed,
+        'started_at': datetime.now(timezone.utc).isoformat(),
+        'calls': {},
+    }
+
+    if args.load:
+        start = time.perf_counter()
+        dataset.generate(args.scale, random.Random(args.seed), args.batch_size)
+        results['load_seconds'] = time.perf_counter() - start
+        print(f"Loaded {args.dataset} at scale {args.scale} in {results['load_seconds']:.1f}s")
+
+    from benchmarks.timing import time_call
+    caller = importlib.import_module('caller')
+
+    for name, call_args, mutates in dataset.CALLS:
+        stats = time_call(getattr(caller, name), call_args, args.warmup, args.repeat, rollback=mutates)
+        results['calls'][name] = stats
+        print(f"{name}: p50 {stats['p50_ms']:.2f}ms, p95 {stats['p95_ms']:.2f}ms, {stats['queries']} queries")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=4))
+    print(f"Results written to {output}")
+
+
+def compare(args):
+    before = json.loads(Path(args.before).read_text())['calls']
+    after = json.loads(Path(args.after).read_text())['calls']
+
+    for name in sorted(before.keys() & after.keys()):
+        old, new = before[name]['p50_ms'], after[name]['p50_ms']
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"{name}: {old:.2f}ms -> {new:.2f}ms ({change:+.1f}%), "
+              f"queries {before[name]['queries']} -> {after[name]['queries']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Time every caller function of a dataset.')
+    run_parser.add_argument('dataset', choices=DATASETS)
+    run_parser.add_argument('--scale', type=int, default=10_000)
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--load', action='store_true', help='Truncate and regenerate the dataset first.')
+    run_parser.add_argument('--batch-size', type=int, default=5000)
+    run_parser.add_argument('--warmup', type=int, default=3)
+    run_parser.add_argument('--repeat', type=int, default=20)
+    run_parser.add_argument('--output')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser('compare', help='Diff the p50 timings of two result files.')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
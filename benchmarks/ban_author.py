@@ -0,0 +1,75 @@
+import argparse
+import random
+import time
+
+from benchmarks.datasets import articles
+from benchmarks.project import setup_project
+
+
+def add_reviews(author_id, count):
+    from django.db import connection
+    from main_app.models import Article, Review
+
+    # Inserted set-based so a million reviews take seconds, the article stats are rebuilt afterwards
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {Review._meta.db_table} (published_on, content, rating, author_id, article_id) '
+            f'SELECT now(), %s, 1 + (n %% 5), %s, a.id '
+            f'FROM generate_series(1, %s) AS n '
+            f'JOIN (SELECT id, row_number() OVER (ORDER BY id) AS position FROM {Article._meta.db_table}) AS a '
+            f'ON a.position = 1 + n %% (SELECT count(*) FROM {Article._meta.db_table})',
+            ['Benchmark review content', author_id, count]
+        )
+
+    Article.objects.rebuild_review_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.ban_author',
+        description='Give one author a large number of reviews, ban them through the batched pipeline '
+                    'and check that the article review stats still match the remaining reviews.',
+    )
+    parser.add_argument('--reviews', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--scale', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--load', action='store_true', help='Truncate and regenerate the articles dataset first.')
+    args = parser.parse_args()
+
+    setup_project(articles.PROJECT)
+    from django.db.models import Count, Sum, F, Q
+    from main_app.banning import ban_author
+    from main_app.models import Author, Article
+
+    if args.load:
+        articles.generate(args.scale, random.Random(args.seed), 5000)
+
+    author = Author.objects.create(
+        full_name='Benchmark Author',
+        email=f'ban-benchmark-{time.time_ns()}@example.com',
+        birth_year=1990,
+    )
+    add_reviews(author.pk, args.reviews)
+
+    report = ban_author(author.email, batch_size=args.batch_size)
+
+    print(f"{report.reviews} reviews deleted in {report.batches} batches, {report.seconds:.2f}s "
+          f"({report.reviews_per_second:.0f} reviews/sec), longest batch {report.longest_batch * 1000:.0f}ms")
+
+    drifted = Article.objects.annotate(
+        actual_count=Count('article_reviews'),
+        actual_sum=Sum('article_reviews__rating', default=0.0),
+    ).filter(
+        ~Q(review_count=F('actual_count')) | Q(rating_sum__gt=F('actual_sum') + 1e-6) | Q(rating_sum__lt=F('actual_sum') - 1e-6)
+    ).count()
+    print(f"articles with drifted review stats: {drifted}")
+
+    author.delete()
+
+    if drifted:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+DATASETS = ('space_missions', 'movies', 'tennis', 'articles', 'orders')
@@ -0,0 +1,66 @@
+PROJECT = 'Exam Preparation/Python ORM Regular Exam - 26 November 2023'
+
+CALLS = [
+    ('get_authors', ('Author 1', None), False),
+    ('get_top_publisher', (), False),
+    ('get_top_reviewer', (), False),
+    ('get_latest_article', (), False),
+    ('get_top_rated_article', (), False),
+    ('ban_author', ('author1@example.com',), True),
+    ('search_articles', ('keyword7 django',), False),
+    ('search_articles', ('"keyword7 keyword8" OR keyword9', 'Science'), False),
+]
+
+WORDS = (
+    'django', 'query', 'index', 'database', 'model', 'science', 'education',
+    'technology', 'research', 'python', 'review', 'article', 'network', 'cache',
+)
+
+
+# Every article mentions two of these, so a keyword search matches about 1% of the corpus
+KEYWORDS = tuple(f'keyword{i}' for i in range(200))
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate(scale, rng, batch_size):
+    from benchmarks.loading import bulk_load, bulk_load_with_m2m, truncate
+    from main_app.models import Author, Article, Review
+
+    truncate(Author, Article, Review)
+
+    author_ids = bulk_load(Author, (
+        Author(
+            full_name=f'Author {i}',
+            email=f'author{i}@example.com',
+            birth_year=rng.randint(1900, 2005),
+        )
+        for i in range(max(10, scale // 10))
+    ), batch_size)
+
+    categories = [choice for choice, _ in Article.CategoryChoices.choices]
+
+    bulk_load_with_m2m(Article, (
+        Article(
+            title=f'Article {i}: {sentence(rng, 4)}',
+            content=f'{sentence(rng, 30)} {" ".join(rng.sample(KEYWORDS, 2))} {sentence(rng, 30)}',
+            category=rng.choice(categories),
+        )
+        for i in range(scale)
+    ), 'authors', lambda article: rng.sample(author_ids, rng.randint(1, 3)), batch_size)
+
+    # Identities were restarted by the truncate, so articles are numbered 1..scale
+    bulk_load(Review, (
+        Review(
+            content=sentence(rng, 20),
+            rating=rng.randint(10, 50) / 10,
+            author_id=rng.choice(author_ids),
+            article_id=rng.randint(1, scale),
+        )
+        for _ in range(scale * 2)
+    ), batch_size)
+
+    # bulk_create sends no signals, so the review stats are computed once at the end
+    Article.objects.rebuild_review_stats()
@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+PROJECT = 'Exam Preparation/Exam Prep I'
+
+CALLS = [
+    ('get_directors', ('Director 1', None), False),
+    ('get_top_director', (), False),
+    ('get_top_actor', (), False),
+    ('get_actors_by_movies_count', (), False),
+    ('get_top_rated_awarded_movie', (), False),
+    ('increase_rating', (), True),
+]
+
+
+def generate(scale, rng, batch_size):
+    from benchmarks.loading import bulk_load, bulk_load_with_m2m, truncate
+    from main_app.models import Director, Actor, Movie
+
+    truncate(Director, Actor, Movie)
+
+    nationalities = ('American', 'British', 'French', 'Italian', 'Japanese')
+    start = date(1920, 1, 1)
+
+    director_ids = bulk_load(Director, (
+        Director(
+            full_name=f'Director {i}',
+            nationality=rng.choice(nationalities),
+            years_of_experience=rng.randint(0, 50),
+        )
+        for i in range(max(5, scale // 20))
+    ), batch_size)
+
+    actor_ids = bulk_load(Actor, (
+        Actor(
+            full_name=f'Actor {i}',
+            nationality=rng.choice(nationalities),
+            is_awarded=rng.random() < 0.2,
+        )
+        for i in range(max(10, scale // 10))
+    ), batch_size)
+
+    genres = [choice for choice, _ in Movie.GenreChoices.choices]
+
+    bulk_load_with_m2m(Movie, (
+        Movie(
+            title=f'Movie number {i}',
+            release_date=start + timedelta(days=rng.randint(0, 36000)),
+            genre=rng.choice(genres),
+            rating=Decimal(rng.randint(0, 100)) / 10,
+            is_classic=rng.random() < 0.1,
+            is_awarded=rng.random() < 0.2,
+            director_id=rng.choice(director_ids),
+            starring_actor_id=rng.choice(actor_ids) if rng.random() < 0.9 else None,
+        )
+        for i in range(scale)
+    ), 'actors', lambda movie: rng.sample(actor_ids, rng.randint(1, 5)), batch_size)
@@ -0,0 +1,53 @@
+from decimal import Decimal
+
+PROJECT = 'Exam Preparation/Exam Prep II'
+
+CALLS = [
+    ('get_profiles', ('Profile 1',), False),
+    ('get_loyal_profiles', (), False),
+    ('get_last_sold_products', (), False),
+    ('get_top_products', (), False),
+    ('apply_discounts', (), True),
+    ('complete_order', (), True),
+]
+
+
+def generate(scale, rng, batch_size):
+    from benchmarks.loading import bulk_load, bulk_load_with_m2m, truncate
+    from main_app.models import Profile, Product, Order
+
+    truncate(Profile, Product, Order)
+
+    profile_ids = bulk_load(Profile, (
+        Profile(
+            full_name=f'Profile {i}',
+            email=f'profile{i}@example.com',
+            phone_number=f'{i:010d}',
+            address=f'{i} Main Street',
+            is_active=rng.random() < 0.9,
+        )
+        for i in range(max(10, scale // 10))
+    ), batch_size)
+
+    product_ids = bulk_load(Product, (
+        Product(
+            name=f'Product {i}',
+            description=f'Description of product {i}',
+            price=Decimal(rng.randint(1, 1000)) / 100,
+            in_stock=rng.randint(0, 1000),
+        )
+        for i in range(max(10, scale // 100))
+    ), batch_size)
+
+    bulk_load_with_m2m(Order, (
+        Order(
+            profile_id=rng.choice(profile_ids),
+            total_price=Decimal(rng.randint(1, 1000)) / 100,
+            is_completed=rng.random() < 0.5,
+        )
+        for _ in range(scale)
+    ), 'products', lambda order: rng.sample(product_ids, rng.randint(1, 5)), batch_size)
+
+    # bulk_create does not send signals, so the denormalized counters are rebuilt afterwards
+    Product.objects.rebuild_sales_counts()
+    Profile.objects.rebuild_order_counts()
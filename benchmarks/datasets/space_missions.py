@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+PROJECT = 'Python ORM Regular Exam - 3 August 2024'
+
+CALLS = [
+    ('get_astronauts', ('12',), False),
+    ('get_top_astronaut', (), False),
+    ('get_top_commander', (), False),
+    ('get_last_completed_mission', (), False),
+    ('get_most_used_spacecraft', (), False),
+    ('decrease_spacecrafts_weight', (), True),
+]
+
+
+def generate(scale, rng, batch_size):
+    from django.core.management import call_command
+
+    from benchmarks.loading import bulk_load, bulk_load_with_m2m, truncate
+    from main_app.models import Astronaut, Spacecraft, SpacecraftFleet, Mission, SpacecraftUtilization
+
+    truncate(Astronaut, Spacecraft, SpacecraftFleet, Mission, SpacecraftUtilization)
+
+    start = date(1960, 1, 1)
+
+    astronaut_ids = bulk_load(Astronaut, (
+        Astronaut(
+            name=f'Astronaut {i}',
+            phone_number=f'{i:010d}',
+            is_active=rng.random() < 0.8,
+            spacewalks=rng.randint(0, 20),
+        )
+        for i in range(max(10, scale // 10))
+    ), batch_size)
+
+    spacecraft_ids = bulk_load(Spacecraft, (
+        Spacecraft(
+            name=f'Spacecraft {i}',
+            manufacturer=rng.choice(('NASA', 'SpaceX', 'Roscosmos', 'ESA')),
+            capacity=rng.randint(1, 10),
+            weight=rng.uniform(100, 5000),
+            launch_date=start + timedelta(days=rng.randint(0, 20000)),
+        )
+        for i in range(max(5, scale // 100))
+    ), batch_size)
+
+    statuses = [choice for choice, _ in Mission.StatusChoices.choices]
+
+    bulk_load_with_m2m(Mission, (
+        Mission(
+            name=f'Mission {i}',
+            status=rng.choice(statuses),
+            launch_date=start + timedelta(days=rng.randint(0, 20000)),
+            spacecraft_id=rng.choice(spacecraft_ids),
+            commander_id=rng.choice(astronaut_ids) if rng.random() < 0.9 else None,
+        )
+        for i in range(scale)
+    ), 'astronauts', lambda mission: rng.sample(astronaut_ids, rng.randint(1, 4)), batch_size)
+
+    # bulk_create does not send signals, so the denormalized counters are rebuilt afterwards
+    call_command('reconcile_astronaut_counters')
+    call_command('rebuild_spacecraft_utilization')
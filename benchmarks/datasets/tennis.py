@@ -0,0 +1,63 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+PROJECT = 'Exam Preparation/Python ORM Retake Exam - 11 December 2023'
+
+CALLS = [
+    ('get_tennis_players', ('Player 1', None), False),
+    ('get_top_tennis_player', (), False),
+    ('get_tennis_player_by_matches_count', (), False),
+    ('get_tournaments_by_surface_type', ('Clay',), False),
+    ('get_latest_match_info', (), False),
+    ('get_matches_by_tournament', ('Tournament 0',), False),
+]
+
+
+def generate(scale, rng, batch_size):
+    from benchmarks.loading import bulk_load, bulk_load_with_m2m, truncate
+    from main_app.models import TennisPlayer, Tournament, Match
+
+    truncate(TennisPlayer, Tournament, Match)
+
+    player_ids = bulk_load(TennisPlayer, (
+        TennisPlayer(
+            full_name=f'Player {i}',
+            birth_date=date(1980, 1, 1) + timedelta(days=rng.randint(0, 9000)),
+            country=rng.choice(('Spain', 'Serbia', 'Switzerland', 'USA', 'Bulgaria')),
+            ranking=rng.randint(1, 300),
+        )
+        for i in range(max(10, scale // 50))
+    ), batch_size)
+
+    surfaces = [choice for choice, _ in Tournament.SurfaceTypeChoices.choices]
+
+    tournament_ids = bulk_load(Tournament, (
+        Tournament(
+            name=f'Tournament {i}',
+            location=f'City {i % 500}',
+            prize_money=Decimal(rng.randint(10_000, 5_000_000)),
+            start_date=date(1990, 1, 1) + timedelta(days=rng.randint(0, 12000)),
+            surface_type=rng.choice(surfaces),
+        )
+        for i in range(max(2, scale // 100))
+    ), batch_size)
+
+    start = datetime(1990, 1, 1, tzinfo=timezone.utc)
+
+    def players(match):
+        pair = rng.sample(player_ids, 2)
+        if match.winner_id and match.winner_id not in pair:
+            pair[0] = match.winner_id
+
+        return pair
+
+    bulk_load_with_m2m(Match, (
+        Match(
+            score=f'{rng.randint(0, 7)}-{rng.randint(0, 7)}',
+            summary=f'Summary of match {i}',
+            date_played=start + timedelta(minutes=rng.randint(0, 17_000_000)),
+            tournament_id=rng.choice(tournament_ids),
+            winner_id=rng.choice(player_ids) if rng.random() < 0.9 else None,
+        )
+        for i in range(scale)
+    ), 'players', players, batch_size)
@@ -0,0 +1,102 @@
+import argparse
+import random
+import time
+
+from benchmarks.datasets import articles
+from benchmarks.project import setup_project
+
+BAD_ROWS = (
+    {'rating': 0.5},
+    {'rating': 'five'},
+    {'content': 'too short'},
+    {'article_id': 0},
+    {'author_id': None},
+)
+
+
+def generate_rows(count, rng, author_ids, article_ids, bad_ratio):
+    for i in range(count):
+        row = {
+            'author_id': rng.choice(author_ids),
+            'article_id': rng.choice(article_ids),
+            'rating': str(rng.randint(10, 50) / 10),
+            'content': f'Benchmark review number {i}',
+        }
+
+        if rng.random() < bad_ratio:
+            row.update(rng.choice(BAD_ROWS))
+
+        yield row
+
+
+def full_clean_rows_per_second(rows):
+    from django.core.exceptions import ValidationError
+    from main_app.models import Review
+
+    start = time.perf_counter()
+    for row in rows:
+        try:
+            Review(**row).full_clean()
+        except ValidationError:
+            pass
+
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.ingest_reviews',
+        description='Validate and load generated November 2023 reviews through the batch validator, '
+                    'compare its validation speed with full_clean() and check the article review stats.',
+    )
+    parser.add_argument('--reviews', type=int, default=1_000_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--bad-ratio', type=float, default=0.01)
+    parser.add_argument('--full-clean-sample', type=int, default=10_000)
+    parser.add_argument('--scale', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--load', action='store_true', help='Truncate and regenerate the articles dataset first.')
+    args = parser.parse_args()
+
+    setup_project(articles.PROJECT)
+    from django.db.models import Count, F
+    from main_app.models import Author, Article, Review
+    from main_app.validation import BatchValidator
+
+    rng = random.Random(args.seed)
+    if args.load:
+        articles.generate(args.scale, rng, 5000)
+
+    author_ids = list(Author.objects.values_list('pk', flat=True))
+    article_ids = list(Article.objects.values_list('pk', flat=True))
+
+    sample = list(generate_rows(args.full_clean_sample, rng, author_ids, article_ids, args.bad_ratio))
+    start = time.perf_counter()
+    BatchValidator(Review).validate(sample)
+    batch_rate = len(sample) / (time.perf_counter() - start)
+    print(f"validation only: batch validator {batch_rate:.0f} rows/sec, "
+          f"full_clean() {full_clean_rows_per_second(sample):.0f} rows/sec")
+
+    first_new_pk = (Review.objects.order_by('-pk').values_list('pk', flat=True).first() or 0) + 1
+    report = Review.objects.ingest(
+        generate_rows(args.reviews, rng, author_ids, article_ids, args.bad_ratio), args.batch_size
+    )
+    print(f"ingest: {report.loaded} of {report.rows} reviews loaded, {len(report.errors)} rejected, "
+          f"{report.seconds:.2f}s ({report.rows_per_second:.0f} rows/sec)")
+
+    drifted = Article.objects.annotate(actual_count=Count('article_reviews')).exclude(
+        review_count=F('actual_count')
+    ).count()
+    print(f"articles with drifted review counts: {drifted}")
+
+    # Removed without the collector, which would send a post_delete per review, then the stats are rebuilt
+    new_reviews = Review.objects.filter(pk__gte=first_new_pk)
+    new_reviews._raw_delete(new_reviews.db)
+    Article.objects.rebuild_review_stats()
+
+    if drifted:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
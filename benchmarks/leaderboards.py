@@ -0,0 +1,126 @@
+import argparse
+import random
+import threading
+import time
+from datetime import date
+
+from benchmarks.datasets import movies
+from benchmarks.project import setup_project
+from benchmarks.timing import percentile
+
+
+def read_uncached():
+    from main_app.models import Director, Actor
+
+    list(Director.objects.get_directors_by_movies_count().values('id', 'full_name', 'movie_count')[:1])
+    list(Actor.objects.get_actors_by_appearances_count().values('id', 'full_name', 'movies_count')[:3])
+
+
+def read_cached():
+    import caller
+
+    caller.get_top_director()
+    caller.get_actors_by_movies_count()
+
+
+def write(rng, director_ids, actor_ids, created):
+    from main_app.models import Movie
+
+    # Writes alternate between adding a movie with a cast and deleting one added earlier
+    if created and rng.random() < 0.5:
+        Movie.objects.filter(pk=created.pop()).delete()
+        return
+
+    movie = Movie.objects.create(
+        title='Leaderboard benchmark movie',
+        release_date=date(2000, 1, 1),
+        director_id=rng.choice(director_ids),
+    )
+    movie.actors.add(*rng.sample(actor_ids, 2))
+    created.append(movie.pk)
+
+
+def worker(read, operations, write_ratio, seed, director_ids, actor_ids, latencies, created):
+    from django.db import connection
+
+    rng = random.Random(seed)
+    own_created = []
+
+    for _ in range(operations):
+        if rng.random() < write_ratio:
+            write(rng, director_ids, actor_ids, own_created)
+            continue
+
+        start = time.perf_counter()
+        read()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    created.extend(own_created)
+    connection.close()
+
+
+def run_phase(name, read, args, director_ids, actor_ids):
+    from main_app.models import Movie
+
+    latencies = []
+    created = []
+    threads = [
+        threading.Thread(target=worker, args=(
+            read, args.operations, args.write_ratio, args.seed + index, director_ids, actor_ids, latencies, created,
+        ))
+        for index in range(args.threads)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    Movie.objects.filter(pk__in=created).delete()
+
+    total = args.operations * args.threads
+    print(f"{name}: {total} operations in {elapsed:.2f}s ({total / elapsed:.0f} ops/sec), "
+          f"reads p50 {percentile(latencies, 50):.2f}ms, p95 {percentile(latencies, 95):.2f}ms, "
+          f"p99 {percentile(latencies, 99):.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.leaderboards',
+        description='Run a mixed read/write workload against the Exam Prep I director and actor '
+                    'leaderboards, first straight from the database and then through the cache.',
+    )
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--operations', type=int, default=500, help='Operations per thread.')
+    parser.add_argument('--write-ratio', type=float, default=0.05)
+    parser.add_argument('--scale', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--load', action='store_true', help='Truncate and regenerate the movies dataset first.')
+    args = parser.parse_args()
+
+    setup_project(movies.PROJECT)
+    from django.core.cache import cache
+    from main_app.managers import leaderboard_metrics
+    from main_app.models import Director, Actor
+
+    if args.load:
+        movies.generate(args.scale, random.Random(args.seed), 5000)
+
+    director_ids = list(Director.objects.values_list('pk', flat=True))
+    actor_ids = list(Actor.objects.values_list('pk', flat=True))
+
+    run_phase('uncached', read_uncached, args, director_ids, actor_ids)
+
+    cache.clear()
+    run_phase('cached', read_cached, args, director_ids, actor_ids)
+
+    for name, events in leaderboard_metrics().items():
+        reads = sum(events.values())
+        print(f"{name}: {events['hit']} hits, {events['stale']} stale, {events['miss']} misses "
+              f"({(events['hit'] + events['stale']) / reads * 100 if reads else 0:.1f}% served from cache)")
+
+
+if __name__ == '__main__':
+    main()
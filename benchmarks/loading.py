@@ -0,0 +1,50 @@
+from django.db import connection
+
+
+def truncate(*models):
+    tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in models)
+    with connection.cursor() as cursor:
+        cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+
+
+def batched(iterable, batch_size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def bulk_load(model, objects, batch_size=5000):
+    pks = []
+    for batch in batched(objects, batch_size):
+        pks.extend(obj.pk for obj in model.objects.bulk_create(batch))
+
+    return pks
+
+
+def bulk_load_with_m2m(model, objects, field_name, pick_related, batch_size=5000):
+    # Through rows are written per batch, right after their parents get their PKs,
+    # so memory stays bounded by batch_size no matter how many objects are loaded
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+
+    total = 0
+    for batch in batched(objects, batch_size):
+        created = model.objects.bulk_create(batch)
+        links = [
+            through(**{f'{source}_id': obj.pk, f'{target}_id': related_pk})
+            for obj in created
+            for related_pk in pick_related(obj)
+        ]
+        through.objects.bulk_create(links, batch_size=batch_size)
+        total += len(created)
+
+    return total
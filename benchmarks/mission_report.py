@@ -0,0 +1,64 @@
+import argparse
+import random
+
+from benchmarks.datasets import space_missions
+from benchmarks.project import setup_project
+from benchmarks.timing import time_call
+
+
+def legacy_report():
+    from django.db.models import Sum
+    from main_app.models import Mission
+
+    # The report as it was built before MissionQuerySet.with_report(), one query per part
+    last_mission = Mission.objects.filter(
+        status=Mission.StatusChoices.COMPLETED
+    ).order_by(
+        '-launch_date'
+    ).first()
+
+    if not last_mission:
+        return 'No data.'
+
+    commander_name = last_mission.commander.name if last_mission.commander else 'TBA'
+    astronauts = last_mission.astronauts.order_by('name').values_list('name', flat=True)
+    all_astronauts = ", ".join(astronauts)
+    total_spacewalks = last_mission.astronauts.aggregate(total_spacewalks=Sum('spacewalks'))['total_spacewalks']
+
+    return (f"The last completed mission is: {last_mission.name}. "
+            f"Commander: {commander_name}. "
+            f"Astronauts: {all_astronauts}. "
+            f"Spacecraft: {last_mission.spacecraft.name}. "
+            f"Total spacewalks: {total_spacewalks}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.mission_report',
+        description='Time the last completed mission report built one query per part against the '
+                    'single-statement MissionQuerySet.with_report() on the same space missions dataset.',
+    )
+    parser.add_argument('--scale', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--load', action='store_true', help='Truncate and regenerate the space missions dataset first.')
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_project(space_missions.PROJECT)
+    import caller
+
+    if args.load:
+        space_missions.generate(args.scale, random.Random(args.seed), 5000)
+
+    if legacy_report() != caller.get_last_completed_mission():
+        raise SystemExit('The two reports differ, the timings would not be comparable.')
+
+    for name, func in (('before', legacy_report), ('after', caller.get_last_completed_mission)):
+        stats = time_call(func, warmup=args.warmup, repeat=args.repeat)
+        print(f"{name}: {stats['queries']} queries, p50 {stats['p50_ms']:.2f}ms, "
+              f"p95 {stats['p95_ms']:.2f}ms, p99 {stats['p99_ms']:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
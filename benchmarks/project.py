@@ -0,0 +1,22 @@
+import logging
+import os
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_project(project):
+    project_dir = REPO_ROOT / project
+    sys.path.insert(0, str(project_dir))
+    os.chdir(project_dir)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'orm_skeleton.settings')
+
+    import django
+    from django.conf import settings
+
+    django.setup()
+
+    # The projects run with DEBUG and SQL logging on, which would dominate the timings
+    settings.DEBUG = False
+    logging.getLogger('django.db.backends').setLevel(logging.WARNING)
@@ -0,0 +1,72 @@
+import argparse
+import multiprocessing
+import random
+import time
+
+from benchmarks.datasets import orders
+from benchmarks.project import setup_project
+
+STOCK = 10 ** 9
+
+
+def complete_all(batch_size):
+    setup_project(orders.PROJECT)
+    from main_app.models import Order
+
+    completed = 0
+    while True:
+        done = Order.objects.complete_pending(batch_size)
+        if not done:
+            return completed
+
+        completed += done
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.stress_orders',
+        description='Complete every order from several processes at once and check that no stock '
+                    'decrement is lost. All orders are reopened and product stock is reset first.',
+    )
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--scale', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--load', action='store_true', help='Truncate and regenerate the orders dataset first.')
+    args = parser.parse_args()
+
+    setup_project(orders.PROJECT)
+    from django.db import connections
+    from django.db.models import Sum
+    from main_app.models import Order, Product
+
+    if args.load:
+        orders.generate(args.scale, random.Random(args.seed), 5000)
+
+    # A stock that can never reach zero, so clamping cannot hide a lost decrement
+    Product.objects.update(in_stock=STOCK, is_available=True)
+    Order.objects.update(is_completed=False)
+
+    expected = Order.products.through.objects.count()
+    stock_before = Product.objects.aggregate(total=Sum('in_stock'))['total']
+    connections.close_all()
+
+    start = time.perf_counter()
+    with multiprocessing.get_context('spawn').Pool(args.workers) as pool:
+        completed = sum(pool.map(complete_all, [args.batch_size] * args.workers))
+    elapsed = time.perf_counter() - start
+
+    stock_after = Product.objects.aggregate(total=Sum('in_stock'))['total']
+    lost = expected - (stock_before - stock_after)
+    still_open = Order.objects.filter(is_completed=False).count()
+
+    print(f"{completed} orders completed by {args.workers} workers in {elapsed:.2f}s "
+          f"({completed / elapsed:.0f} orders/sec)")
+    print(f"expected decrements: {expected}, lost decrements: {lost}, orders left open: {still_open}")
+
+    if lost or still_open:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import statistics
+import time
+
+from django.db import transaction
+
+from query_budget import measure
+
+
+def percentile(samples, percent):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def run_once(func, args, rollback):
+    if not rollback:
+        return measure(func, *args)
+
+    # Mutating calls are rolled back so every repeat sees the same data
+    with transaction.atomic():
+        outcome = measure(func, *args)
+        transaction.set_rollback(True)
+
+    return outcome
+
+
+def time_call(func, args=(), warmup=3, repeat=20, rollback=False):
+    for _ in range(warmup):
+        run_once(func, args, rollback)
+
+    samples = []
+    queries = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, recorder = run_once(func, args, rollback)
+        samples.append((time.perf_counter() - start) * 1000)
+        queries = recorder.count
+
+    return {
+        'queries': queries,
+        'repeat': repeat,
+        'min_ms': min(samples),
+        'mean_ms': statistics.fmean(samples),
+        'p50_ms': percentile(samples, 50),
+        'p95_ms': percentile(samples, 95),
+        'p99_ms': percentile(samples, 99),
+        'max_ms': max(samples),
+    }
@@ -0,0 +1 @@
+from increments.querysets import IncrementQuerySetMixin
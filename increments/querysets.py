@@ -0,0 +1,55 @@
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import connections
+
+
+class IncrementQuerySetMixin:
+    def increment(self, field_name, amount, minimum=None, maximum=None, clamp=True):
+        field = self.model._meta.get_field(field_name)
+
+        # The bounds default to the field's validators, so the update can never store an invalid value
+        if minimum is None:
+            minimum = next((v.limit_value for v in field.validators if isinstance(v, MinValueValidator)), None)
+        if maximum is None:
+            maximum = next((v.limit_value for v in field.validators if isinstance(v, MaxValueValidator)), None)
+
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        pk = quote(self.model._meta.pk.column)
+        column = quote(field.column)
+
+        value, value_params = f'{column} + %s', [amount]
+        conditions, condition_params = [], []
+
+        for bound, function, operator in ((maximum, 'LEAST', '<'), (minimum, 'GREATEST', '>')):
+            if bound is None:
+                continue
+
+            if clamp:
+                value = f'{function}({value}, %s)'
+                value_params.append(bound)
+
+            moving_towards = amount > 0 if operator == '<' else amount < 0
+            if not moving_towards:
+                continue
+
+            # Clamped rows already at the bound would not change, unclamped ones would overshoot it
+            if clamp:
+                conditions.append(f'{column} {operator} %s')
+                condition_params.append(bound)
+            else:
+                conditions.append(f'{column} + %s {operator}= %s')
+                condition_params.extend([amount, bound])
+
+        pks_sql, pks_params = self.order_by().values('pk').query.get_compiler(using=self.db).as_sql()
+        where = ' AND '.join([f'{pk} IN ({pks_sql})'] + conditions)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} SET {column} = {value} '
+                f'WHERE {where} '
+                f'RETURNING {pk}',
+                value_params + list(pks_params) + condition_params
+            )
+
+            return [row[0] for row in cursor.fetchall()]
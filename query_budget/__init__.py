@@ -0,0 +1,9 @@
+from query_budget.recorder import (
+    QueryBudgetExceeded,
+    QueryRecorder,
+    budgeted,
+    check_budget,
+    instrument,
+    load_budgets,
+    measure,
+)
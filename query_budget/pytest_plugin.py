@@ -0,0 +1,49 @@
+import pytest
+
+from query_budget.recorder import QueryBudgetExceeded, check_budget, load_budgets, measure
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--query-budgets',
+        default='query_budgets.json',
+        help='JSON file with the per-function query budgets.',
+    )
+
+
+def pytest_configure(config):
+    config._query_budget_results = []
+
+
+@pytest.fixture(scope='session')
+def query_budgets(pytestconfig):
+    return load_budgets(pytestconfig.rootpath / pytestconfig.getoption('--query-budgets'))
+
+
+@pytest.fixture
+def query_budget(pytestconfig, query_budgets):
+    def run(func, *args, name=None, **kwargs):
+        budget_name = name or func.__name__
+        result, recorder = measure(func, *args, **kwargs)
+        pytestconfig._query_budget_results.append((budget_name, recorder.count, recorder.total_time))
+
+        try:
+            check_budget(budget_name, recorder, query_budgets)
+        except QueryBudgetExceeded as exc:
+            message = str(exc)
+        else:
+            return result
+
+        pytest.fail(message, pytrace=False)
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = getattr(config, '_query_budget_results', [])
+    if not results:
+        return
+
+    terminalreporter.section('query budgets')
+    for name, count, total_time in results:
+        terminalreporter.write_line(f"{name}: {count} queries, {total_time * 1000:.1f}ms")
@@ -0,0 +1,113 @@
+import functools
+import inspect
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connections, DEFAULT_DB_ALIAS
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryRecorder:
+    def __init__(self, using=DEFAULT_DB_ALIAS, keep_slowest=5):
+        self.using = using
+        self.keep_slowest = keep_slowest
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.total_time += duration
+
+            self.slowest.append((duration, sql))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.keep_slowest:]
+
+    @contextmanager
+    def record(self):
+        with connections[self.using].execute_wrapper(self):
+            yield self
+
+    def report(self):
+        lines = [f"{self.count} queries in {self.total_time * 1000:.1f}ms"]
+        for duration, sql in self.slowest:
+            lines.append(f"  {duration * 1000:.1f}ms: {sql}")
+
+        return '\n'.join(lines)
+
+
+def load_budgets(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+
+    with path.open() as file:
+        return json.load(file)
+
+
+def check_budget(name, recorder, budgets):
+    budget = budgets.get(name)
+    if budget is None:
+        return
+
+    max_queries = budget.get('max_queries')
+    max_time_ms = budget.get('max_time_ms')
+
+    if max_queries is not None and recorder.count > max_queries:
+        raise QueryBudgetExceeded(
+            f"{name} issued {recorder.count} queries, budget is {max_queries}.\n{recorder.report()}"
+        )
+
+    if max_time_ms is not None and recorder.total_time * 1000 > max_time_ms:
+        raise QueryBudgetExceeded(
+            f"{name} spent {recorder.total_time * 1000:.1f}ms in the database, budget is {max_time_ms}ms.\n"
+            f"{recorder.report()}"
+        )
+
+
+def measure(func, *args, **kwargs):
+    recorder = QueryRecorder()
+    with recorder.record():
+        result = func(*args, **kwargs)
+
+        # Generators only hit the database while they are consumed
+        if hasattr(result, '__next__'):
+            result = list(result)
+
+    return result, recorder
+
+
+def budgeted(budgets, name=None):
+    def decorator(func):
+        budget_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result, recorder = measure(func, *args, **kwargs)
+            check_budget(budget_name, recorder, budgets)
+            return result
+
+        wrapper.query_budget = budgets.get(budget_name)
+        return wrapper
+
+    return decorator
+
+
+def instrument(module, budgets):
+    for name, func in list(vars(module).items()):
+        if name.startswith('_') or not inspect.isfunction(func) or func.__module__ != module.__name__:
+            continue
+
+        setattr(module, name, budgeted(budgets, name)(func))
+
+    return module
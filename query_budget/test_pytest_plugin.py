@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+
+pytest_plugins = ['pytester']
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+
+CONFTEST = '''
+import django
+from django.conf import settings
+
+
+def pytest_configure():
+    settings.configure(DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}})
+    django.setup()
+'''
+
+TESTS = '''
+from django.db import connection
+
+
+def run_queries(count):
+    with connection.cursor() as cursor:
+        for _ in range(count):
+            cursor.execute('SELECT 1')
+
+    return count
+
+
+def test_within_budget(query_budget):
+    assert query_budget(run_queries, 2) == 2
+
+
+def test_over_budget(query_budget):
+    query_budget(run_queries, 3)
+'''
+
+
+def run_with_budgets(pytester, monkeypatch, budgets):
+    monkeypatch.setenv('PYTHONPATH', str(REPOSITORY_ROOT))
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(test_budgets=TESTS)
+    pytester.makefile('.json', query_budgets=json.dumps(budgets))
+
+    # A subprocess, so the inner run configures its own Django settings
+    return pytester.runpytest_subprocess('-p', 'query_budget.pytest_plugin', '-p', 'no:django')
+
+
+def test_query_budget_fails_only_the_test_over_budget(pytester, monkeypatch):
+    result = run_with_budgets(pytester, monkeypatch, {'run_queries': {'max_queries': 2}})
+
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines([
+        '*run_queries issued 3 queries, budget is 2.*',
+        '*query budgets*',
+        'run_queries: 2 queries, *ms',
+        'run_queries: 3 queries, *ms',
+    ])
+
+
+def test_query_budget_passes_without_a_budget(pytester, monkeypatch):
+    result = run_with_budgets(pytester, monkeypatch, {})
+
+    result.assert_outcomes(passed=2)
+
+
+def test_query_budget_fails_over_the_time_budget(pytester, monkeypatch):
+    result = run_with_budgets(pytester, monkeypatch, {'run_queries': {'max_time_ms': 0}})
+
+    result.assert_outcomes(failed=2)
+    result.stdout.fnmatch_lines(['*run_queries spent *ms in the database, budget is 0ms.*'])
@@ -0,0 +1 @@
+from reports.sinks import write_lines
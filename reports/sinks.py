@@ -0,0 +1,7 @@
+def write_lines(lines, sink):
+    count = 0
+    for line in lines:
+        sink.write(f"{line}\n")
+        count += 1
+
+    return count